@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Render many variants of the charts from a parameter file
+  JSON  a list of objects, or {"chart": ..., "variants": [...]}
+  CSV   one row per variant; a cell with spaces is a list of numbers
+Each variant names its chart (or takes --chart), an optional output name, and
+keyword arguments for the chart's plot function. Every row is checked before
+anything renders, and each chart's model outputs (parity year, exhaustion
+date, 2036 capability) are computed for all of its variants in one
+vectorized pass and written to the manifest
+Variants render in a process pool forked from a warm parent, in tasks of
+up to --chunk variants of one chart; charts with a template draw a task's
+variants on one reused figure. At most --max-pending tasks are queued at
+once, each worker holds one figure at a time, and files and manifest lines
+are written as variants finish
+"""
+import argparse
+import contextlib
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+import figures
+from charts import CHARTS, MODEL_PARAMETERS, TEMPLATES, chart_name, check_arguments
+from forecast import compute_parity, data_exhaustion, scenarios
+
+MANIFEST = 'manifest.jsonl'
+# Variants of one chart per pool task
+CHUNK = 16
+
+
+# ============================================
+# Parameter files
+# ============================================
+def _value(cell):
+    """CSV cell -> int, float, list of numbers or string."""
+    parts = cell.split()
+    if len(parts) > 1:
+        return [_value(part) for part in parts]
+    try:
+        number = float(cell)
+    except ValueError:
+        return cell
+    return int(number) if number.is_integer() else number
+
+
+def read_variants(path, chart=None):
+    """
+    [{'chart', 'name', 'params'}] from a JSON or CSV parameter file; raises
+    ValueError naming every row whose chart, arguments or name is invalid
+    (a path, or repeated for the same chart)
+    """
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            # Names stay as written: 007 is not 7, and 1e3 is not 1000
+            rows = [{key: cell if key == 'name' else _value(cell) for key, cell in row.items() if cell.strip()}
+                    for row in csv.DictReader(f)]
+        else:
+            data = json.load(f)
+            if isinstance(data, dict):
+                chart = data.get('chart', chart)
+                data = data['variants']
+            rows = data
+
+    width = len(str(len(rows) - 1))
+    variants, errors = [], []
+    seen = set()
+    for i, row in enumerate(rows):
+        params = dict(row)
+        name = str(params.pop('name', f'{i:0{width}d}'))
+        if name in ('', '.', '..') or os.path.basename(name) != name:
+            errors.append(f"row {i} ({name}): name must be a plain file name")
+            continue
+        if not params.get('chart', chart):
+            errors.append(f"row {i} ({name}): no chart (give one per row or --chart)")
+            continue
+        try:
+            filename = chart_name(params.pop('chart', chart))
+            check_arguments(filename, params)
+        except (KeyError, TypeError) as e:
+            errors.append(f"row {i} ({name}): {e.args[0]}")
+            continue
+        if (filename, name) in seen:
+            errors.append(f"row {i} ({name}): duplicate name for {filename}")
+            continue
+        seen.add((filename, name))
+        variants.append({'chart': filename, 'name': name, 'params': params})
+    if errors:
+        raise ValueError('invalid variants:\n  ' + '\n  '.join(errors))
+    return variants
+
+
+# ============================================
+# Vectorized model outputs per variant
+# ============================================
+def _columns(variants):
+    """One array per model parameter across all variants of a chart (defaults where not given)."""
+    defaults = MODEL_PARAMETERS[variants[0]['chart']]
+    return {key: np.array([v['params'].get(key, default) for v in variants], dtype=float)
+            for key, default in defaults.items()}
+
+
+def _scaling_summary(variants):
+    curves = scenarios.evaluate([2036], **_columns(variants))
+    return {f'{name}_2036': values[:, -1] for name, values in curves.items()}
+
+
+def _parity_summary(variants):
+    return {'parity_year': compute_parity.parity_year(**_columns(variants))}
+
+
+def _exhaustion_summary(variants):
+    return {'exhaustion_year': data_exhaustion.exhaustion_dates(**_columns(variants))}
+
+
+# Chart -> function of its variants returning {column: array with one value per variant}
+SUMMARIES = {
+    'scaling_limits.png': _scaling_summary,
+    'power_bottleneck.png': _parity_summary,
+    'data_timeline.png': _exhaustion_summary,
+}
+
+
+def summarize(variants):
+    """Attach each chart's model outputs to its variants, one vectorized pass per chart."""
+    for chart, summary in SUMMARIES.items():
+        group = [v for v in variants if v['chart'] == chart]
+        if not group:
+            continue
+        for column, values in summary(group).items():
+            # Never reached within the horizon -> null, which JSON can carry
+            for variant, value in zip(group, values.tolist()):
+                variant.setdefault('summary', {})[column] = value if np.isfinite(value) else None
+    return variants
+
+
+# ============================================
+# Rendering
+# ============================================
+def output_stem(variant):
+    return f"{os.path.splitext(variant['chart'])[0]}-{variant['name']}"
+
+
+def _entry(render, variant, formats, use_cache):
+    start = time.perf_counter()
+    try:
+        outputs = render(variant['params'], formats, use_cache)
+        filename = output_stem(variant) + '.png'
+        figures.write_outputs(filename, outputs)
+        return dict(variant, files=list(figures.output_names(filename, formats).values()),
+                    seconds=time.perf_counter() - start)
+    except Exception as e:
+        return dict(variant, error=f'{type(e).__name__}: {e}', seconds=time.perf_counter() - start)
+
+
+def render_chunk(chunk, formats=('png',), use_cache=True):
+    """
+    Runs in a pool process: render and write variants of one chart (on one
+    reused figure when the chart has a template); returns their manifest entries
+    """
+    import matplotlib.pyplot as plt
+
+    chart = chunk[0]['chart']
+    if chart in TEMPLATES:
+        renderer = figures.reused_figure(CHARTS[chart], TEMPLATES[chart])
+    else:
+        renderer = contextlib.nullcontext(
+            lambda params, formats, use_cache: figures.render_chart(CHARTS[chart], formats, use_cache, params))
+    try:
+        with renderer as render:
+            return [_entry(render, variant, formats, use_cache) for variant in chunk]
+    finally:
+        plt.close('all')
+
+
+def chunks(variants, jobs, size=CHUNK):
+    """
+    Variants grouped by chart into pool tasks: up to `size` per task for
+    charts with a template (fewer if that would leave workers idle), one
+    per task otherwise
+    """
+    by_chart = {}
+    for variant in variants:
+        by_chart.setdefault(variant['chart'], []).append(variant)
+    for chart, group in by_chart.items():
+        n = min(size, -(-len(group) // jobs)) if chart in TEMPLATES else 1
+        for i in range(0, len(group), n):
+            yield group[i:i + n]
+
+
+def run(variants, formats=('png',), jobs=None, max_pending=None, use_cache=True, manifest=MANIFEST,
+        chunk=CHUNK):
+    """
+    Render every variant into figures.OUTPUT_DIR and stream a manifest line
+    per finished variant; returns (rendered, failed)
+    """
+    import render_worker
+
+    jobs = jobs or os.cpu_count() or 1
+    max_pending = max_pending or 2 * jobs
+    render_worker.warm()
+    todo = chunks(variants, jobs, chunk)
+    rendered = failed = 0
+    report_every = max(1, len(variants) // 20)
+    start = time.perf_counter()
+    with open(figures.output_path(manifest), 'w') as out, \
+            ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context('fork')) as pool:
+        pending = set()
+        while True:
+            # Back-pressure: only top the queue up to max_pending
+            for task in todo:
+                pending.add(pool.submit(render_chunk, task, formats, use_cache))
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for entry in (entry for future in finished for entry in future.result()):
+                out.write(json.dumps(entry) + '\n')
+                if 'error' in entry:
+                    failed += 1
+                    print(f"  failed {output_stem(entry)}: {entry['error']}", file=sys.stderr)
+                else:
+                    rendered += 1
+                done = rendered + failed
+                if done % report_every == 0 or done == len(variants):
+                    elapsed = time.perf_counter() - start
+                    print(f"  {done:,}/{len(variants):,} variants, {elapsed:.1f}s ({done / elapsed:.1f}/s)",
+                          flush=True)
+            out.flush()
+    return rendered, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render chart variants from a JSON or CSV parameter file')
+    parser.add_argument('params', help='parameter file (.json or .csv)')
+    parser.add_argument('--chart', help='chart for rows that do not name one, e.g. scaling_limits')
+    parser.add_argument('-o', '--output-dir', default='variants', help='where to write (default: variants/)')
+    parser.add_argument('--formats', default='png', help='comma-separated formats (see build.py)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: one per CPU)')
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help='tasks queued at once (default: twice the workers)')
+    parser.add_argument('--chunk', type=int, default=CHUNK,
+                        help=f'variants of one chart per task (default: {CHUNK})')
+    parser.add_argument('--no-cache', action='store_true', help='re-render, ignoring the render cache')
+    args = parser.parse_args()
+    formats = tuple(args.formats.split(','))
+    unknown = [fmt for fmt in formats if fmt not in figures.FORMATS and fmt != 'thumb']
+    if unknown:
+        parser.error(f"unknown format: {', '.join(unknown)}")
+
+    try:
+        variants = summarize(read_variants(args.params, args.chart))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    figures.set_output_dir(args.output_dir)
+    start = time.perf_counter()
+    rendered, failed = run(variants, formats, args.jobs, args.max_pending,
+                           not args.no_cache, chunk=args.chunk)
+    print(f"\n{rendered:,} variants rendered, {failed} failed, in {time.perf_counter() - start:.1f}s; "
+          f"manifest in {figures.output_path(MANIFEST)}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Benchmark every chart and the PDF build, phase by phase
+Each target runs in a fresh interpreter so every phase is measured cold:
+  cold_start  interpreter start-up until this script's first line runs
+  import      importing the chart module (matplotlib, numpy, the models)
+  compute     the shared model baselines the plot uses (agi_monte_carlo etc.)
+  draw        the plot function: data prep and artist creation
+  save        rendering and PNG encoding (for the PDF: the reportlab build)
+plus peak RSS. Every run starts with an empty render cache, so cached work
+(the PDF's image encoding) is measured too; the PDF's cache holds only the
+charts it embeds, rendered beforehand. Results are written as JSON and
+compared against a stored baseline; a phase that regresses beyond the
+threshold fails the run
+"""
+import time
+
+_STARTED = time.time()
+
+import argparse
+import importlib
+import inspect
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import types
+
+PHASES = ['cold_start', 'import', 'compute', 'draw', 'save']
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(REPO_DIR, 'benchmark_baseline.json')
+OUTPUT_FILE = 'benchmark.json'
+
+# A phase regresses when it is THRESHOLD slower than the baseline and at
+# least MIN_DELTA seconds slower (phases of a few ms are mostly noise)
+THRESHOLD = 0.20
+MIN_DELTA = 0.05
+RSS_THRESHOLD = 0.20
+
+
+# ============================================
+# Child: one target in a fresh interpreter
+# ============================================
+def _takes_no_arguments(func):
+    return all(p.default is not p.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+               for p in inspect.signature(func).parameters.values())
+
+
+def _baseline_functions(func, seen=None):
+    """
+    The shared model baselines (lru_cached `baseline` functions) func's code
+    refers to that take no arguments; one that needs arguments (such as
+    ensemble.baseline(projection)) runs inside the draw phase instead
+    """
+    seen = set() if seen is None else seen
+    found = []
+    code_names = set()
+    stack = [func.__code__]
+    while stack:
+        code = stack.pop()
+        code_names |= set(code.co_names)
+        stack += [c for c in code.co_consts if isinstance(c, types.CodeType)]
+    for name in sorted(code_names):
+        value = func.__globals__.get(name)
+        if isinstance(value, types.ModuleType) and callable(getattr(value, 'baseline', None)):
+            value = value.baseline
+        if (callable(value) and getattr(value, '__name__', '') == 'baseline' and value not in seen
+                and _takes_no_arguments(value)):
+            seen.add(value)
+            found.append(value)
+    return found
+
+
+def _run_chart(module_name, plot_name, filename):
+    phases = {}
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import figures
+    phases['import'] = time.perf_counter() - start
+    plot = getattr(module, plot_name)
+
+    start = time.perf_counter()
+    for baseline in _baseline_functions(plot):
+        baseline()
+    phases['compute'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fig = plot()
+    phases['draw'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open(figures.output_path(filename), 'wb') as f:
+        f.write(figures.render_png(fig))
+    phases['save'] = time.perf_counter() - start
+    return phases
+
+
+def _run_pdf():
+    phases = {}
+    start = time.perf_counter()
+    import generate_pdf
+    phases['import'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for module in [sys.modules[f'forecast.{name}'] for name in ('agi_monte_carlo', 'compute_parity', 'data_exhaustion')]:
+        module.baseline()
+    phases['compute'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    generate_pdf.compile_report()
+    phases['draw'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    generate_pdf.build_pdf()
+    phases['save'] = time.perf_counter() - start
+    return phases
+
+
+def child(spec):
+    """Measure one target; spec is 'module:plot:filename' or 'pdf'. Prints one JSON line."""
+    started = _STARTED
+    sys.path.insert(0, REPO_DIR)
+    phases = _run_pdf() if spec == 'pdf' else _run_chart(*spec.split(':'))
+    phases['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({'started': started, 'phases': phases}))
+
+
+# ============================================
+# Parent: run, record, compare
+# ============================================
+def _targets():
+    """{target filename: child spec} for every chart plus the PDF."""
+    import build
+    import generate_pdf
+    specs = {name: f'{plot.__module__}:{plot.__name__}:{name}' for name, plot in build.CHARTS.items()}
+    specs[generate_pdf.PDF_FILENAME] = 'pdf'
+    return specs
+
+
+def measure(spec, output_dir, seed_cache=None):
+    """Run one target in a fresh interpreter and return its phases; seed_cache is copied into its cache."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if seed_cache:
+            shutil.copytree(seed_cache, cache_dir, dirs_exist_ok=True)
+        env = dict(os.environ, LLM_FORECAST_CACHE=cache_dir, LLM_FORECAST_OUTPUT=output_dir)
+        launched = time.time()
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', spec],
+                                capture_output=True, text=True, cwd=REPO_DIR, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f'benchmark of {spec} failed:\n{result.stderr}')
+    reply = json.loads(result.stdout.strip().splitlines()[-1])
+    phases = reply['phases']
+    phases['cold_start'] = reply['started'] - launched
+    phases['total'] = sum(phases[p] for p in PHASES)
+    return phases
+
+
+def run(names=None, repeat=1):
+    """
+    Benchmark the given targets (default: every chart, then the PDF) and
+    return the results document; each number is the median over `repeat` runs
+    """
+    import matplotlib
+    import numpy as np
+    import reportlab
+
+    import generate_pdf
+
+    specs = _targets()
+    names = names or list(specs)
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir, tempfile.TemporaryDirectory() as chart_cache:
+        if generate_pdf.PDF_FILENAME in names:
+            # The PDF embeds the charts from the render cache; fill one to start its runs from
+            subprocess.run([sys.executable, os.path.join(REPO_DIR, 'build.py'), '-j', '1', *generate_pdf.chart_files()],
+                           check=True, capture_output=True, cwd=REPO_DIR,
+                           env=dict(os.environ, LLM_FORECAST_CACHE=chart_cache, LLM_FORECAST_OUTPUT=output_dir))
+        for name in names:
+            seed_cache = chart_cache if specs[name] == 'pdf' else None
+            runs = [measure(specs[name], output_dir, seed_cache) for _ in range(repeat)]
+            results[name] = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+            row = results[name]
+            print(f"  {name:<32}" + ''.join(f"{row[p]:8.2f}" for p in PHASES + ['total'])
+                  + f"{row['peak_rss_mb']:9.0f}", flush=True)
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'matplotlib': matplotlib.__version__,
+            'numpy': np.__version__,
+            'reportlab': reportlab.Version,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'repeat': repeat,
+        },
+        'results': results,
+        'total': sum(row['total'] for row in results.values()),
+    }
+
+
+def compare(current, baseline, threshold=THRESHOLD, min_delta=MIN_DELTA, rss_threshold=RSS_THRESHOLD):
+    """Return a list of regression messages (empty if none) for targets present in both."""
+    regressions = []
+    for name, row in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        for phase in PHASES + ['total']:
+            delta = row[phase] - base[phase]
+            if delta > min_delta and row[phase] > base[phase] * (1 + threshold):
+                regressions.append(f"{name} {phase}: {base[phase]:.2f}s -> {row[phase]:.2f}s "
+                                   f"(+{delta / max(base[phase], 1e-9):.0%})")
+        if row['peak_rss_mb'] > base['peak_rss_mb'] * (1 + rss_threshold):
+            regressions.append(f"{name} peak RSS: {base['peak_rss_mb']:.0f} MB -> {row['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark every chart and the PDF build, phase by phase')
+    parser.add_argument('targets', nargs='*', help='targets to benchmark (default: all)')
+    parser.add_argument('-r', '--repeat', type=int, default=1, help='runs per target (median is reported)')
+    parser.add_argument('-o', '--output', default=OUTPUT_FILE, help=f'results JSON (default: {OUTPUT_FILE})')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help=f'allowed slowdown per phase, as a fraction (default: {THRESHOLD})')
+    parser.add_argument('--min-delta', type=float, default=MIN_DELTA,
+                        help=f'ignore slowdowns smaller than this many seconds (default: {MIN_DELTA})')
+    parser.add_argument('--budget', type=float, default=None, help='fail if the summed total exceeds this (s)')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return 0
+
+    print(f"  {'target':<32}" + ''.join(f"{p[:8]:>8}" for p in PHASES + ['total']) + f"{'RSS MB':>9}")
+    current = run(args.targets, args.repeat)
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+    print(f"\n{len(current['results'])} targets, {current['total']:.2f}s summed; results in {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    failed = False
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(current, json.load(f), args.threshold, args.min_delta)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        failed = bool(regressions)
+        if not regressions:
+            print(f"No regressions against {args.baseline}")
+    else:
+        print(f"No baseline at {args.baseline} (create one with --save-baseline)")
+
+    if args.budget is not None and current['total'] > args.budget:
+        print(f"OVER BUDGET: {current['total']:.2f}s summed > {args.budget:.2f}s")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
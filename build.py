@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Build every chart and the PDF report from one entry point
+Each output file is a target in a dependency graph; independent targets
+render at the same time in a process pool sized to the machine
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import generate_pdf
+from charts import CHARTS
+from figures import FORMATS, set_output_dir, write_cached_chart, write_chart
+
+
+# Formats every chart target writes unless --formats says otherwise
+DEFAULT_FORMATS = ('png',)
+
+
+def _chart_target(filename, plot):
+    def build(use_cache=True, formats=DEFAULT_FORMATS):
+        write_chart(filename, plot, use_cache, formats)
+    return build
+
+
+def _pdf_target(use_cache=True, formats=DEFAULT_FORMATS):
+    generate_pdf.build_pdf()
+
+
+def _html_target(use_cache=True, formats=DEFAULT_FORMATS):
+    generate_pdf.build_html()
+
+
+# Target filename -> (build function, filenames it depends on)
+TARGETS = {name: (_chart_target(name, plot), ()) for name, plot in CHARTS.items()}
+TARGETS[generate_pdf.PDF_FILENAME] = (_pdf_target, tuple(name for name in generate_pdf.chart_files() if name in CHARTS))
+TARGETS[generate_pdf.HTML_FILENAME] = (_html_target, ())
+
+
+def run_target(name, use_cache=True, formats=DEFAULT_FORMATS):
+    """Build one target in a worker process and return its wall-clock time."""
+    start = time.perf_counter()
+    TARGETS[name][0](use_cache, formats)
+    return time.perf_counter() - start
+
+
+def resolve(names):
+    """Return the requested targets plus everything they depend on."""
+    wanted = []
+    visiting = set()
+
+    def visit(name):
+        if name not in TARGETS:
+            raise KeyError(f"Unknown target: {name}")
+        if name in wanted:
+            return
+        if name in visiting:
+            raise RuntimeError(f"Dependency cycle through target: {name}")
+        visiting.add(name)
+        for dep in TARGETS[name][1]:
+            visit(dep)
+        wanted.append(name)
+
+    for name in names:
+        visit(name)
+    return wanted
+
+
+def build(names=None, jobs=None, use_cache=True, formats=DEFAULT_FORMATS):
+    """
+    Build the given targets (default: all) and return {target: seconds}
+    A target is submitted as soon as all of its dependencies have finished;
+    charts already in the render cache are copied here without a worker.
+    Chart targets write every format in `formats` (see figures.FORMATS)
+    """
+    pending = resolve(names or list(TARGETS))
+    jobs = jobs or min(os.cpu_count() or 1, len(pending))
+    done = set()
+    timings = {}
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        running = {}
+        while pending or running:
+            ready = [n for n in pending if all(d in done for d in TARGETS[n][1])]
+            if not ready and not running:
+                raise RuntimeError(f"Dependency cycle between targets: {', '.join(pending)}")
+            for name in ready:
+                pending.remove(name)
+                start = time.perf_counter()
+                if use_cache and name in CHARTS and write_cached_chart(name, CHARTS[name], formats):
+                    timings[name] = time.perf_counter() - start
+                    done.add(name)
+                    print(f"  cached {name:<31} {timings[name]:6.2f}s")
+                else:
+                    running[pool.submit(run_target, name, use_cache, formats)] = name
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                timings[name] = future.result()
+                done.add(name)
+                print(f"  built {name:<32} {timings[name]:6.2f}s")
+
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('targets', nargs='*', help='targets to build (default: all)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--no-cache', action='store_true', help='re-render every chart, ignoring the render cache')
+    parser.add_argument('--formats', default=','.join(DEFAULT_FORMATS),
+                        help=f"comma-separated chart formats: {', '.join(FORMATS)}, thumb (default: png)")
+    parser.add_argument('-o', '--output-dir', help='write the outputs here (default: $LLM_FORECAST_OUTPUT '
+                                                   'or the script directory)')
+    parser.add_argument('--list', action='store_true', help='list targets and exit')
+    args = parser.parse_args(argv)
+    formats = tuple(args.formats.split(','))
+    unknown = [fmt for fmt in formats if fmt not in FORMATS and fmt != 'thumb']
+    if unknown:
+        parser.error(f"unknown format: {', '.join(unknown)}")
+
+    if args.list:
+        for name, (_, deps) in TARGETS.items():
+            print(f"{name}" + (f"  <- {', '.join(deps)}" if deps else ''))
+        return 0
+
+    if args.output_dir:
+        set_output_dir(args.output_dir)
+    start = time.perf_counter()
+    timings = build(args.targets, args.jobs, use_cache=not args.no_cache, formats=formats)
+    wall = time.perf_counter() - start
+
+    print(f"\nBuilt {len(timings)} targets in {wall:.2f}s wall clock "
+          f"({sum(timings.values()):.2f}s of target time, slowest {max(timings.values()):.2f}s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
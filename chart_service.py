@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Local HTTP chart service for the dashboard
+  GET /power_bottleneck.png?china_start=0.6      the chart, with its plot
+                                                 function's keyword arguments
+                                                 taken from the query string
+  GET /scaling_limits.png?ceiling=250&format=svg any figures.FORMATS name or thumb
+  GET /agi_market_projection.png?centralized_api=60,50,40,30,25
+                                                 a sequence argument, comma-separated
+  GET /                                          the charts, as JSON
+  GET /stats                                     cache and render counters
+The server warms up like render_worker.py, then forks a pool of render
+processes so the event loop never blocks on matplotlib. Replies are kept in
+an in-memory LRU cache keyed on the chart, format and normalized parameters
+(numbers are parsed, keys sorted), and concurrent requests for the same key
+wait on one render. Behind that sits the on-disk render cache
+`load` is a small load generator reporting latency percentiles
+"""
+import argparse
+import asyncio
+import collections
+import functools
+import json
+import multiprocessing
+import os
+import sys
+import time
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+HOST = '127.0.0.1'
+PORT = 8765
+CACHE_BYTES = 256 * 1024 * 1024
+BACKLOG = 1024
+
+CONTENT_TYPES = {
+    'png': 'image/png',
+    'print': 'image/png',
+    'svg': 'image/svg+xml',
+    'pdf': 'application/pdf',
+    'thumb': 'image/webp',
+}
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error'}
+
+_cache = collections.OrderedDict()
+_inflight = {}
+stats = {'requests': 0, 'hits': 0, 'coalesced': 0, 'renders': 0, 'errors': 0, 'cached_bytes': 0}
+
+
+# ============================================
+# Rendering
+# ============================================
+def _render(name, fmt, params):
+    """Runs in a pool process: one chart, figures always closed afterwards."""
+    import matplotlib.pyplot as plt
+
+    import charts
+    try:
+        return charts.render(name, fmt, **dict(params))
+    finally:
+        plt.close('all')
+
+
+def _number(value):
+    """Query value -> int, float, tuple of them (comma-separated) or string."""
+    if ',' in value:
+        return tuple(_number(part) for part in value.split(','))
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return int(number) if number.is_integer() else number
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize(path, query):
+    """
+    (chart filename, format, sorted parameter tuple) for a request; raises
+    KeyError for an unknown chart and ValueError for a bad format or parameter
+    (including a sequence of the wrong length), before anything renders
+    """
+    import charts
+    from figures import FORMATS
+
+    params = dict(urllib.parse.parse_qsl(query, keep_blank_values=True))
+    fmt = params.pop('format', 'png')
+    if fmt not in FORMATS and fmt != 'thumb':
+        raise ValueError(f"unknown format: {fmt}")
+    name = charts.chart_name(urllib.parse.unquote(path.lstrip('/')))
+    params = {key: _number(value) for key, value in params.items()}
+    try:
+        charts.check_arguments(name, params)
+    except TypeError as e:
+        raise ValueError(str(e)) from None
+    return name, fmt, tuple(sorted(params.items()))
+
+
+def _remember(key, data, max_bytes):
+    _cache[key] = data
+    stats['cached_bytes'] += len(data)
+    while stats['cached_bytes'] > max_bytes and len(_cache) > 1:
+        _, evicted = _cache.popitem(last=False)
+        stats['cached_bytes'] -= len(evicted)
+
+
+async def chart(service, key):
+    """Encoded chart for a normalized key: from the LRU cache, an in-flight render or a new one."""
+    data = _cache.get(key)
+    if data is not None:
+        _cache.move_to_end(key)
+        stats['hits'] += 1
+        return data
+    if key in _inflight:
+        stats['coalesced'] += 1
+        future, pool = _inflight[key]
+    else:
+        stats['renders'] += 1
+        pool = service['pool']
+        try:
+            future = asyncio.get_running_loop().run_in_executor(pool, _render, *key)
+        except BrokenProcessPool:
+            _restart(service, pool)
+            raise
+        _inflight[key] = future, pool
+
+        def done(future):
+            _inflight.pop(key, None)
+            if not future.cancelled() and future.exception() is None:
+                _remember(key, future.result(), service['cache_bytes'])
+        future.add_done_callback(done)
+    # A client that disconnects must not cancel a render others are waiting on
+    try:
+        return await asyncio.shield(future)
+    except BrokenProcessPool:
+        _restart(service, pool)
+        raise
+
+
+def _restart(service, pool):
+    """Replace a broken pool once, however many requests saw it fail."""
+    if service['pool'] is pool:
+        service['pool'] = _pool(service['workers'])
+        pool.shutdown(wait=False)
+
+
+# ============================================
+# HTTP
+# ============================================
+def _response(status, body, content_type='application/json', keep_alive=True):
+    """Header and body buffers; chart bytes are written as they are, not copied."""
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body).encode() + b'\n'
+    head = (f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+            f'Content-Type: {content_type}\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return [head.encode(), body]
+
+
+async def _reply(service, method, target):
+    """(status, body, content type) for one request."""
+    if method != 'GET':
+        return 405, {'error': f'{method} not supported'}, 'application/json'
+    path, _, query = target.partition('?')
+    if path == '/':
+        import charts
+        return 200, sorted(charts.CHARTS), 'application/json'
+    if path == '/stats':
+        return 200, dict(stats, cached_charts=len(_cache), in_flight=len(_inflight)), 'application/json'
+    try:
+        key = normalize(path, query)
+    except KeyError as e:
+        return 404, {'error': e.args[0]}, 'application/json'
+    except ValueError as e:
+        return 400, {'error': str(e)}, 'application/json'
+    try:
+        return 200, await chart(service, key), CONTENT_TYPES[key[1]]
+    except BrokenProcessPool:
+        stats['errors'] += 1
+        return 500, {'error': 'render process died; pool restarted'}, 'application/json'
+    except (TypeError, ValueError) as e:
+        stats['errors'] += 1
+        return 400, {'error': f'{type(e).__name__}: {e}'}, 'application/json'
+    except Exception as e:
+        stats['errors'] += 1
+        return 500, {'error': f'{type(e).__name__}: {e}'}, 'application/json'
+
+
+async def _skip_body(reader, headers):
+    """Read past a request body so the next request starts where it should; False if it can't be."""
+    if 'transfer-encoding' in headers:
+        return False
+    length = int(headers.get('content-length') or 0)
+    while length > 0:
+        chunk = await reader.read(min(length, 65536))
+        if not chunk:
+            return False
+        length -= len(chunk)
+    return length == 0
+
+
+async def _connection(service, reader, writer):
+    """Serve requests on one keep-alive connection until the client closes it."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                writer.writelines(_response(400, {'error': 'malformed request line'}, keep_alive=False))
+                break
+            # A body is never used, but must be consumed before the next request is read
+            keep_alive = (headers.get('connection', '').lower() != 'close' and version != 'HTTP/1.0'
+                          and await _skip_body(reader, headers))
+            stats['requests'] += 1
+            status, body, content_type = await _reply(service, method, target)
+            for buf in _response(status, body, content_type, keep_alive):
+                writer.write(buf)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+def _pool(workers):
+    # Forked from the warm server, so a render process starts with everything imported
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'))
+
+
+async def _serve(host, port, workers, cache_bytes):
+    service = {'pool': _pool(workers), 'workers': workers, 'cache_bytes': cache_bytes}
+    server = await asyncio.start_server(lambda r, w: _connection(service, r, w), host, port, backlog=BACKLOG)
+    print(f"Chart service on http://{host}:{port}/ ({workers} render process{'es' if workers > 1 else ''}, "
+          f"{cache_bytes // 2 ** 20} MB cache)", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service['pool'].shutdown(cancel_futures=True)
+
+
+def serve(host=HOST, port=PORT, workers=None, cache_bytes=CACHE_BYTES):
+    """Warm up, then serve charts until interrupted."""
+    import render_worker
+
+    start = time.perf_counter()
+    render_worker.warm()
+    print(f"Warm in {time.perf_counter() - start:.2f}s", flush=True)
+    try:
+        asyncio.run(_serve(host, port, workers or os.cpu_count() or 1, cache_bytes))
+    except KeyboardInterrupt:
+        pass
+
+
+# ============================================
+# Load generator
+# ============================================
+async def _client(host, port, target, count, latencies, failures):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = f'GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode()
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            status = (await reader.readline()).split()[1]
+            length = 0
+            while (line := await reader.readline()) not in (b'\r\n', b''):
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':')[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if status != b'200':
+                failures.append(status.decode())
+    finally:
+        writer.close()
+
+
+async def _load(host, port, targets, concurrency, requests):
+    latencies, failures = [], []
+    per_client = -(-requests // concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, targets[i % len(targets)], per_client, latencies, failures)
+                           for i in range(concurrency)))
+    return latencies, failures, time.perf_counter() - start
+
+
+def load(targets, concurrency=200, requests=10_000, host=HOST, port=PORT):
+    """Hit the service from `concurrency` keep-alive connections; returns a summary dict."""
+    latencies, failures, wall = asyncio.run(_load(host, port, targets, concurrency, requests))
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000
+    return {'requests': len(latencies), 'failures': len(failures), 'seconds': wall,
+            'rps': len(latencies) / wall, 'p50_ms': pct(50), 'p90_ms': pct(90), 'p99_ms': pct(99),
+            'max_ms': latencies[-1] * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local HTTP chart service')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='run the service')
+    serve_parser.add_argument('-j', '--workers', type=int, default=None,
+                              help='render processes (default: one per CPU)')
+    serve_parser.add_argument('--cache-mb', type=int, default=CACHE_BYTES // 2 ** 20,
+                              help='in-memory reply cache size')
+
+    load_parser = commands.add_parser('load', help='load-test a running service')
+    load_parser.add_argument('targets', nargs='+', help='request paths, e.g. /data_wall.png?format=svg')
+    load_parser.add_argument('-c', '--concurrency', type=int, default=200)
+    load_parser.add_argument('-n', '--requests', type=int, default=10_000)
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.host, args.port, args.workers, args.cache_mb * 2 ** 20)
+        return 0
+
+    result = load(args.targets, args.concurrency, args.requests, args.host, args.port)
+    print(f"{result['requests']:,} requests in {result['seconds']:.2f}s ({result['rps']:,.0f}/s), "
+          f"{result['failures']} failed")
+    print(f"latency ms: p50 {result['p50_ms']:.2f}  p90 {result['p90_ms']:.2f}  "
+          f"p99 {result['p99_ms']:.2f}  max {result['max_ms']:.2f}")
+    return 1 if result['failures'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Every chart in the report, by filename, rendered in memory
+render('data_wall.png') returns the encoded bytes (from the render cache when
+possible) without touching the output directory; keyword arguments go to the
+chart's plot function, so charts that take model parameters can be rendered
+as variants
+"""
+import inspect
+
+import generate_agi_future
+import generate_conclusion
+import generate_data_wall
+import generate_power_chart
+import generate_scaling_limits
+import generate_sector_pies
+from figures import render_chart
+from forecast import compute_parity, data_exhaustion, scenarios
+
+CHART_MODULES = [
+    generate_agi_future,
+    generate_power_chart,
+    generate_scaling_limits,
+    generate_data_wall,
+    generate_sector_pies,
+    generate_conclusion,
+]
+
+# Chart filename -> plot function, and -> template for charts that can
+# render variants on one figure (see figures.reused_figure)
+CHARTS = {}
+TEMPLATES = {}
+for _module in CHART_MODULES:
+    CHARTS.update(_module.FIGURES)
+    TEMPLATES.update(getattr(_module, 'TEMPLATES', {}))
+
+# Charts whose plot function passes its keyword arguments on to a model: that model's parameters
+MODEL_PARAMETERS = {
+    'scaling_limits.png': scenarios.DEFAULTS,
+    'power_bottleneck.png': compute_parity.DEFAULTS,
+    'data_timeline.png': data_exhaustion.DEFAULTS,
+}
+
+
+def chart_name(name):
+    """The chart filename for 'data_wall.png' or 'data_wall'."""
+    for candidate in (name, name + '.png'):
+        if candidate in CHARTS:
+            return candidate
+    raise KeyError(f"Unknown chart: {name}")
+
+
+def _count(value):
+    """Number of values in a sequence argument, None for a single value."""
+    return len(value) if isinstance(value, (tuple, list)) else None
+
+
+def check_arguments(name, params):
+    """
+    Raise TypeError unless chart `name` (a filename) takes these keyword
+    arguments, each a single value or a sequence as long as its default
+    """
+    signature = inspect.signature(CHARTS[name])
+    signature.bind(**params)
+    unknown = set(params) - set(MODEL_PARAMETERS.get(name, params))
+    if unknown:
+        raise TypeError(f"unexpected keyword argument {', '.join(map(repr, sorted(unknown)))}")
+    defaults = {**MODEL_PARAMETERS.get(name, {}),
+                **{key: p.default for key, p in signature.parameters.items() if p.default is not p.empty}}
+    for key, value in params.items():
+        if key in defaults and _count(value) != _count(defaults[key]):
+            expected = 'one value' if _count(defaults[key]) is None else f'{_count(defaults[key])} values'
+            got = 'one' if _count(value) is None else _count(value)
+            raise TypeError(f"{key} takes {expected}, got {got}")
+
+
+def render(name, fmt='png', use_cache=True, **params):
+    """Encoded bytes of one chart in one format (a figures.FORMATS name or 'thumb')."""
+    name = chart_name(name)
+    check_arguments(name, params)
+    return render_chart(CHARTS[name], (fmt,), use_cache, params)[fmt]
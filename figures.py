@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Shared output settings for the generate_*.py chart scripts
+render_chart() returns a chart's encoded bytes from an in-memory buffer (or
+the render cache); writing them to OUTPUT_DIR is a separate, optional step
+A chart can also be written as a print PNG, SVG, PDF and a WebP thumbnail;
+the plot function runs once and every format is saved from that figure
+Charts with a template (see reused_figure) render many variants on one
+figure by updating its artists instead of building a new figure each time
+Ensembles of trajectories are drawn as one collection (spaghetti) or, when
+there are too many lines to see, binned into a density raster (density)
+"""
+import contextlib
+import inspect
+import io
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import Collection, LineCollection
+from matplotlib.colors import LinearSegmentedColormap, to_rgba, to_rgba_array
+from matplotlib.lines import Line2D
+from PIL import Image
+
+import render_cache
+from forecast import profiling
+
+# Written files go here: $LLM_FORECAST_OUTPUT, or next to the scripts
+OUTPUT_DIR = os.environ.get('LLM_FORECAST_OUTPUT', os.path.dirname(os.path.abspath(__file__)))
+
+# Every chart in the report is written with the same settings
+SAVEFIG_KWARGS = dict(dpi=150, bbox_inches='tight', facecolor='white', edgecolor='none')
+
+# Output formats: name -> (filename suffix, savefig settings). 'png' is the
+# chart file itself; the others are written next to it. Vector formats carry
+# no creation date (and SVG ids use a fixed salt) so identical charts give
+# identical files
+FORMATS = {
+    'png': ('.png', SAVEFIG_KWARGS),
+    'print': ('@300dpi.png', dict(SAVEFIG_KWARGS, dpi=300)),
+    'svg': ('.svg', dict(SAVEFIG_KWARGS, format='svg', metadata={'Date': None})),
+    'pdf': ('.pdf', dict(SAVEFIG_KWARGS, format='pdf', metadata={'CreationDate': None})),
+}
+VECTOR_FORMATS = {'svg', 'pdf'}
+
+# Thumbnails are scaled down from the 150-dpi PNG, not drawn again
+THUMBNAIL_SUFFIX = '.thumb.webp'
+THUMBNAIL_WIDTH = 480
+THUMBNAIL_QUALITY = 80
+
+# Lines and collections in an axes holding more points/paths than this are
+# drawn as an image (at the savefig dpi) inside SVG and PDF output instead of
+# as individual paths
+DENSE_ARTIST_ELEMENTS = 5000
+
+# Trajectory ensembles with more lines than this are drawn as a density
+# raster: points per interval between two x values, y bins, members binned at a time
+MAX_SPAGHETTI_LINES = 2000
+DENSITY_SAMPLES = 24
+DENSITY_BINS = 300
+DENSITY_BLOCK = 10_000
+
+
+def output_path(filename):
+    """Path of an output file, creating OUTPUT_DIR if needed."""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    return os.path.join(OUTPUT_DIR, filename)
+
+
+def set_output_dir(path):
+    """Write output files to path, here and in any process started afterwards."""
+    global OUTPUT_DIR
+    OUTPUT_DIR = os.environ['LLM_FORECAST_OUTPUT'] = os.path.abspath(path)
+
+
+def render_png(fig):
+    """Encode a finished figure as PNG bytes and release it."""
+    buf = io.BytesIO()
+    with profiling.span('save', format='png'):
+        fig.savefig(buf, format='png', **SAVEFIG_KWARGS)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def _element_count(artist):
+    if isinstance(artist, Line2D):
+        return len(artist.get_xydata())
+    if isinstance(artist, Collection):
+        return max(len(artist.get_offsets()), sum(len(path.vertices) for path in artist.get_paths()))
+    return 0
+
+
+def rasterize_dense(fig, limit=DENSE_ARTIST_ELEMENTS):
+    """
+    Mark lines and collections as rasterized where an axes is dense: every
+    one of them in an axes whose lines and collections together exceed
+    `limit` elements (one huge artist or many small ones). Returns how many
+    """
+    marked = 0
+    for ax in fig.findobj(Axes):
+        artists = list(ax.lines) + list(ax.collections)
+        if sum(_element_count(a) for a in artists) > limit:
+            for artist in artists:
+                artist.set_rasterized(True)
+            marked += len(artists)
+    return marked
+
+
+def fan(ax, x, bands, color, label=None):
+    """
+    Draw quantile bands (rows at symmetric levels around the median, as
+    ensemble.BANDS) as a fan: each band darker than the one around it, the
+    median as a line. Returns the median line
+    """
+    n = len(bands) // 2
+    for i in range(n):
+        ax.fill_between(x, bands[i], bands[-1 - i], color=color, alpha=0.15 * (i + 1), linewidth=0)
+    return ax.plot(x, bands[n], color=color, linewidth=2.5, label=label)[0]
+
+
+def spaghetti(ax, x, members, color, alpha=0.05, linewidth=0.5, **kwargs):
+    """
+    Draw trajectories (members, shape (lines, len(x))) as a single
+    LineCollection, so a thousand lines cost about what one does. color and
+    alpha are one value for every line or one per line. Returns the collection
+    """
+    members = np.asarray(members)
+    segments = np.empty(members.shape + (2,))
+    segments[..., 0] = x
+    segments[..., 1] = members
+    colors = np.broadcast_to(to_rgba_array(color), (len(members), 4)).copy()
+    colors[:, 3] *= alpha
+    lines = LineCollection(segments, colors=colors, linewidths=linewidth, **kwargs)
+    ax.add_collection(lines)
+    ax.autoscale_view()
+    return lines
+
+
+def density(ax, x, members, color, ylim=None, samples=DENSITY_SAMPLES, bins=DENSITY_BINS, **kwargs):
+    """
+    Draw trajectories (members, shape (lines, len(x))) as a density raster:
+    each line is sampled `samples` times per interval of x, as it would be
+    drawn (straight in log space on a log axis), and binned into `bins` y
+    bins over ylim (default the data range). Each column is shaded by the
+    share of lines in a bin relative to its busiest bin, from transparent to
+    `color`. Returns the QuadMesh
+    """
+    x = np.asarray(x, dtype=float)
+    log = ax.get_yscale() == 'log'
+    lo, hi = ylim or (np.min(members), np.max(members))
+    lo, hi = (np.log10(lo), np.log10(hi)) if log else (lo, hi)
+    t = np.arange(samples) / samples
+    xs = np.append((x[:-1, None] + np.diff(x)[:, None] * t).ravel(), x[-1])
+    counts = np.zeros(len(xs) * bins)
+    column = np.arange(len(xs)) * bins
+    for start in range(0, len(members), DENSITY_BLOCK):
+        block = np.asarray(members[start:start + DENSITY_BLOCK], dtype=float)
+        block = np.log10(block) if log else block
+        ys = block[:, :-1, None] + np.diff(block, axis=1)[:, :, None] * t
+        ys = np.concatenate([ys.reshape(len(block), -1), block[:, -1:]], axis=1)
+        row = np.floor((ys - lo) / (hi - lo) * bins).astype(int)
+        inside = (row >= 0) & (row < bins)
+        counts += np.bincount((column + row)[inside], minlength=len(counts))
+    counts = counts.reshape(len(xs), bins).T
+    shade = np.ma.masked_equal(counts / np.maximum(counts.max(axis=0), 1), 0)
+
+    x_edges = np.concatenate([[xs[0]], (xs[:-1] + xs[1:]) / 2, [xs[-1]]])
+    y_edges = np.linspace(lo, hi, bins + 1)
+    cmap = LinearSegmentedColormap.from_list('density', [to_rgba(color, 0), to_rgba(color, 1)])
+    return ax.pcolormesh(x_edges, 10 ** y_edges if log else y_edges, shade, cmap=cmap, vmin=0, vmax=1,
+                         shading='flat', rasterized=True, **kwargs)
+
+
+def trajectories(ax, x, members, color, max_lines=MAX_SPAGHETTI_LINES, **kwargs):
+    """spaghetti() for up to max_lines lines, else density(); kwargs go to whichever draws."""
+    draw = spaghetti if len(members) <= max_lines else density
+    return draw(ax, x, members, color, **kwargs)
+
+
+def thumbnail(png):
+    """WebP thumbnail, THUMBNAIL_WIDTH pixels wide, from PNG bytes."""
+    image = Image.open(io.BytesIO(png)).convert('RGB')
+    image = image.resize((THUMBNAIL_WIDTH, round(THUMBNAIL_WIDTH * image.height / image.width)),
+                         Image.Resampling.LANCZOS)
+    buf = io.BytesIO()
+    image.save(buf, format='webp', quality=THUMBNAIL_QUALITY, method=6)
+    return buf.getvalue()
+
+
+def output_names(filename, formats):
+    """{format: output filename} for a chart written as `filename` ('thumb' is the WebP thumbnail)."""
+    stem = os.path.splitext(filename)[0]
+    return {fmt: stem + (THUMBNAIL_SUFFIX if fmt == 'thumb' else FORMATS[fmt][0]) for fmt in formats}
+
+
+def render_formats(fig, formats, close=True):
+    """
+    Save one finished figure in every requested format and release it
+    (unless close is False); returns {format: bytes}. Dense artists are
+    rasterized for the vector formats, which are saved last so the PNGs are
+    unaffected
+    """
+    outputs = {}
+    with plt.rc_context({'svg.hashsalt': 'llm_forecast'}):
+        for fmt in sorted(formats, key=lambda f: (f in VECTOR_FORMATS, f)):
+            if fmt in VECTOR_FORMATS:
+                rasterize_dense(fig)
+            buf = io.BytesIO()
+            with profiling.span('save', format=fmt):
+                fig.savefig(buf, **{'format': 'png', **FORMATS[fmt][1]})
+            outputs[fmt] = buf.getvalue()
+    if close:
+        plt.close(fig)
+    return outputs
+
+
+def _format_key(plot, fmt, params=None):
+    return render_cache.figure_key(plot, FORMATS[fmt][1], params)
+
+
+def _drawn_formats(formats):
+    # The thumbnail is made from the PNG
+    return {'png' if fmt == 'thumb' else fmt for fmt in formats}
+
+
+def _cached(plot, formats, use_cache, params):
+    """{drawn format: cached bytes or None} for the formats behind `formats`."""
+    return {fmt: render_cache.lookup(_format_key(plot, fmt, params)) if use_cache else None
+            for fmt in _drawn_formats(formats)}
+
+
+def _render(plot, formats, use_cache, params, name):
+    """({format: bytes}, whether plot() ran) for the drawn formats behind `formats`."""
+    outputs = _cached(plot, formats, use_cache, params)
+    missing = {fmt for fmt, data in outputs.items() if data is None}
+    if not missing:
+        return outputs, False
+    with profiling.figure(name):
+        with profiling.span('artist creation'):
+            fig = plot(**(params or {}))
+        outputs.update(render_formats(fig, missing))
+    for fmt in missing:
+        render_cache.store(_format_key(plot, fmt, params), outputs[fmt])
+    return outputs, True
+
+
+def _with_thumbnail(outputs, formats):
+    return {fmt: thumbnail(outputs['png']) if fmt == 'thumb' else outputs[fmt] for fmt in formats}
+
+
+def render_chart(plot, formats=('png',), use_cache=True, params=None):
+    """
+    Encoded chart of plot(**params) in each of `formats` (FORMATS names or
+    'thumb'), as {format: bytes}; nothing is written to disk. Formats missing
+    from the render cache are all saved from a single plot() call
+    """
+    outputs, _ = _render(plot, formats, use_cache, params, plot.__name__)
+    return _with_thumbnail(outputs, formats)
+
+
+@contextlib.contextmanager
+def reused_figure(plot, template):
+    """
+    Context manager giving render(params, formats=('png',), use_cache=True),
+    which returns the same {format: bytes} as render_chart(plot, ...) but
+    draws every variant on one figure. template() builds the figure once and
+    returns (fig, update); update takes plot's arguments (defaults filled in)
+    and sets the artists' data in place. plot(**params) must itself be
+    template() followed by update, so the bytes match a fresh render
+    The figure is built on the first cache miss (and again after a variant
+    fails) and closed on exit
+    """
+    signature = inspect.signature(plot)
+    state = {}
+
+    def render(params, formats=('png',), use_cache=True):
+        outputs = _cached(plot, formats, use_cache, params)
+        missing = {fmt for fmt, data in outputs.items() if data is None}
+        if missing:
+            if 'fig' not in state:
+                with profiling.span('artist creation', template=template.__name__):
+                    state['fig'], state['update'] = template()
+            bound = signature.bind(**params)
+            bound.apply_defaults()
+            try:
+                with profiling.span('artist update'):
+                    state['update'](*bound.args, **bound.kwargs)
+                outputs.update(render_formats(state['fig'], missing, close=False))
+            except Exception:
+                # A half-updated figure is not reused; the next variant builds a new one
+                plt.close(state.pop('fig'))
+                raise
+            for fmt in missing:
+                render_cache.store(_format_key(plot, fmt, params), outputs[fmt])
+        return _with_thumbnail(outputs, formats)
+
+    try:
+        yield render
+    finally:
+        if 'fig' in state:
+            plt.close(state['fig'])
+
+
+def write_outputs(filename, outputs):
+    """Write render_chart() output to OUTPUT_DIR as `filename` and its per-format siblings."""
+    for fmt, name in output_names(filename, outputs).items():
+        with open(output_path(name), 'wb') as f:
+            f.write(outputs[fmt])
+
+
+def write_cached_chart(filename, plot, formats=('png',)):
+    """Copy plot()'s chart from the render cache if every format is present; returns True on a hit."""
+    outputs = {fmt: render_cache.lookup(_format_key(plot, fmt)) for fmt in _drawn_formats(formats)}
+    if None in outputs.values():
+        return False
+    write_outputs(filename, _with_thumbnail(outputs, formats))
+    print(f"Chart copied from cache: {filename}")
+    return True
+
+
+def write_chart(filename, plot, use_cache=True, formats=('png',), params=None):
+    """Render plot(**params) as with render_chart() and write it to the output directory."""
+    outputs, drawn = _render(plot, formats, use_cache, params, filename)
+    write_outputs(filename, _with_thumbnail(outputs, formats))
+    if not drawn:
+        print(f"Chart copied from cache: {filename}")
+        return
+    extra = [name for fmt, name in output_names(filename, formats).items() if fmt != 'png']
+    print(f"Chart saved: {filename}" + (f" (+ {', '.join(extra)})" if extra else ''))
@@ -0,0 +1,52 @@
+"""
+The forecast models as an importable package
+Capability scenarios (scenarios), binding constraints (constraints), the data
+wall (data_exhaustion, model_collapse), the compute race (compute_parity),
+sector mix (sector_model) and market tiers (market), plus the Monte Carlo
+(agi_monte_carlo) and ensemble (ensemble, ensemble_store) layers built on
+them. They import only NumPy and return arrays:
+    from forecast import scenarios
+    curves = scenarios.evaluate([2030, 2036], growth=[0.3, 0.4])
+Submodules are imported on first use, so `import forecast` loads nothing
+else. matplotlib and reportlab are imported only when render() or
+build_pdf() is called
+"""
+import importlib
+
+MODULES = [
+    'scenarios',
+    'constraints',
+    'data_exhaustion',
+    'model_collapse',
+    'compute_parity',
+    'sector_model',
+    'market',
+    'agi_monte_carlo',
+    'ensemble',
+    'ensemble_store',
+    'profiling',
+]
+
+
+def __getattr__(name):
+    if name in MODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + MODULES)
+
+
+def render(chart, fmt='png', use_cache=True, **params):
+    """Encoded bytes of one report chart, as charts.render(); imports matplotlib on first call."""
+    import charts
+
+    return charts.render(chart, fmt, use_cache, **params)
+
+
+def build_pdf(filename=None, sections=None):
+    """Write the PDF report to the output directory, as generate_pdf.build_pdf(); imports reportlab on first call."""
+    import generate_pdf
+
+    generate_pdf.build_pdf(filename or generate_pdf.PDF_FILENAME, sections)
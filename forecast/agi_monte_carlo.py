@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo estimate of the probability of AGI by year (2026-2031)
+Samples the capability scenarios from scenarios.py with
+uncertain growth parameters, an uncertain AGI threshold and uncertain
+scenario weights; draws are processed in fixed-size chunks so memory stays
+bounded however many draws are requested
+"""
+import functools
+
+import numpy as np
+
+from forecast import scenarios
+from forecast.profiling import traced
+from forecast.scenarios import AGI_THRESHOLD, DEFAULTS
+
+YEARS = np.arange(2026, 2032)
+
+SCENARIOS = ['Optimistic', 'Moderate', 'Pessimistic', 'Plateau']
+
+# Prior belief in each scenario; sampled from a Dirichlet around these values
+SCENARIO_WEIGHTS = np.array([0.15, 0.35, 0.30, 0.20])
+WEIGHT_CONCENTRATION = 20
+
+# Spread of each scenario parameter around its central value in scenarios.DEFAULTS
+GROWTH_SD = 0.05           # optimistic/moderate initial annual growth
+DECAY_SD = 0.005           # moderate growth lost per year
+CEILING_SIGMA = 0.20       # pessimistic ceiling, log-normal sigma
+RATE_SD = 0.03             # pessimistic rate of approach to the ceiling
+PLATEAU_GROWTH_SD = 0.03   # plateau growth before stagnation
+LATE_GROWTH_SD = 0.01      # plateau growth after stagnation
+THRESHOLD_SIGMA = 0.5      # log-normal sigma of the AGI threshold
+
+SEED = 2026
+N_DRAWS = 2_000_000
+CHUNK_SIZE = 250_000
+N_WEIGHT_SAMPLES = 10_000
+
+
+def _capability(rng, scenario, t):
+    """Capability trajectories for one chunk: scenario (n,) x elapsed years t -> (n, len(t))."""
+    cap = np.empty((scenario.size, t.size))
+
+    def normal(name, sd, k):
+        return rng.normal(DEFAULTS[name], sd, size=k)
+
+    idx = np.flatnonzero(scenario == 0)
+    cap[idx] = scenarios.optimistic(t, normal('growth', GROWTH_SD, idx.size))
+
+    idx = np.flatnonzero(scenario == 1)
+    cap[idx] = scenarios.moderate(t, normal('growth', GROWTH_SD, idx.size),
+                                  normal('decay', DECAY_SD, idx.size))
+
+    idx = np.flatnonzero(scenario == 2)
+    ceiling = DEFAULTS['ceiling'] * np.exp(rng.normal(0, CEILING_SIGMA, size=idx.size))
+    cap[idx] = scenarios.pessimistic(t, ceiling, normal('rate', RATE_SD, idx.size))
+
+    idx = np.flatnonzero(scenario == 3)
+    cap[idx] = scenarios.plateau(t, DEFAULTS['plateau_years'],
+                                 normal('plateau_growth', PLATEAU_GROWTH_SD, idx.size),
+                                 normal('late_growth', LATE_GROWTH_SD, idx.size))
+
+    return cap
+
+
+def simulate(n_draws=N_DRAWS, seed=SEED, chunk_size=CHUNK_SIZE,
+             n_weight_samples=N_WEIGHT_SAMPLES, ci=0.95):
+    """
+    Run the simulation and return a dict of results:
+      years                 years covered
+      scenario_probability  P(AGI by year | scenario), shape (scenarios, years)
+      probability           P(AGI by year), weighted over sampled scenario weights
+      ci_low, ci_high       central `ci` interval of that probability
+    Draws are assigned to scenarios round-robin so each scenario gets an
+    equal share; results are reproducible for a given seed and chunk_size
+    """
+    t = YEARS - scenarios.BASE_YEAR
+    hits = np.zeros((len(SCENARIOS), t.size))
+    counts = np.zeros(len(SCENARIOS))
+
+    n_chunks = -(-n_draws // chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks + 1)
+    for i in range(n_chunks):
+        rng = np.random.default_rng(seeds[i])
+        start = i * chunk_size
+        scenario = np.arange(start, min(start + chunk_size, n_draws)) % len(SCENARIOS)
+
+        threshold = AGI_THRESHOLD * np.exp(rng.normal(0, THRESHOLD_SIGMA, size=(scenario.size, 1)))
+        # AGI "by year" means the threshold was crossed in that year or earlier
+        reached = np.logical_or.accumulate(_capability(rng, scenario, t) >= threshold, axis=1)
+
+        for s in range(len(SCENARIOS)):
+            mask = scenario == s
+            hits[s] += reached[mask].sum(axis=0)
+            counts[s] += mask.sum()
+
+    scenario_probability = hits / counts[:, None]
+
+    rng = np.random.default_rng(seeds[-1])
+    weights = rng.dirichlet(WEIGHT_CONCENTRATION * SCENARIO_WEIGHTS, size=n_weight_samples)
+    weighted = weights @ scenario_probability
+    tail = (1 - ci) / 2 * 100
+
+    return {
+        'years': YEARS,
+        'n_draws': n_draws,
+        'seed': seed,
+        'scenario_probability': scenario_probability,
+        'probability': SCENARIO_WEIGHTS @ scenario_probability,
+        'ci_low': np.percentile(weighted, tail, axis=0),
+        'ci_high': np.percentile(weighted, 100 - tail, axis=0),
+    }
+
+
+@traced()
+@functools.lru_cache(maxsize=None)
+def baseline():
+    """Results with the default settings, shared by the charts and the PDF (do not modify)."""
+    return simulate()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Monte Carlo estimate of P(AGI) by year')
+    parser.add_argument('-n', '--draws', type=int, default=N_DRAWS)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    results = simulate(args.draws, args.seed, args.chunk_size)
+
+    print(f"{args.draws:,} draws, seed {args.seed}")
+    print('Year  ' + ''.join(f'{name:>13}' for name in SCENARIOS) + '     Weighted (95% CI)')
+    for j, year in enumerate(results['years']):
+        per_scenario = ''.join(f'{p:>12.1%} ' for p in results['scenario_probability'][:, j])
+        print(f"{year}  {per_scenario}  {results['probability'][j]:6.1%} "
+              f"({results['ci_low'][j]:.1%}-{results['ci_high'][j]:.1%})")
+
+
+if __name__ == '__main__':
+    main()
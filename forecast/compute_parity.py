@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+US vs China compute-parity model with sensitivity analysis
+Effective compute = starting capacity x power build-out (capped by the grid)
+x compounding efficiency gains. The parity year is the interpolated year
+China's capacity overtakes the US; one-at-a-time and Sobol analyses report how
+much each input moves it. Evaluations are vectorized per chunk and chunks are
+spread over a process pool
+"""
+import functools
+import os
+import time
+
+import numpy as np
+
+from forecast.profiling import traced
+
+BASE_YEAR = 2026
+US_BASE = 100  # US/West capacity index in BASE_YEAR
+TIMES = BASE_YEAR + np.arange(0, 34 * 4 + 1) / 4  # quarterly to 2060; later parity counts as 2060
+
+# Central assumptions behind power_bottleneck.png
+DEFAULTS = dict(
+    china_start=0.70,          # China capacity relative to the US in BASE_YEAR
+    us_power_growth=0.10,      # annual growth of power available to US AI compute
+    us_grid_limit=1.20,        # US power ceiling, multiple of BASE_YEAR power
+    us_efficiency=0.05,        # annual US compute-per-watt gain
+    china_power_growth=0.22,   # annual growth of power available to Chinese AI compute
+    china_grid_limit=8.0,      # China power ceiling, multiple of BASE_YEAR power
+    china_efficiency=0.03,     # annual Chinese compute-per-watt gain (behind under sanctions)
+)
+
+# Uniform ranges for the sensitivity analyses
+RANGES = dict(
+    china_start=(0.55, 0.85),
+    us_power_growth=(0.05, 0.15),
+    us_grid_limit=(1.1, 1.6),
+    us_efficiency=(0.03, 0.08),
+    china_power_growth=(0.15, 0.30),
+    china_grid_limit=(3.0, 10.0),
+    china_efficiency=(0.01, 0.05),
+)
+
+LABELS = dict(
+    china_start='China starting capacity',
+    us_power_growth='US power build-out',
+    us_grid_limit='US grid ceiling',
+    us_efficiency='US efficiency gains',
+    china_power_growth='China power build-out',
+    china_grid_limit='China grid ceiling',
+    china_efficiency='China efficiency gains',
+)
+
+SEED = 2026
+N_BASE = 2 ** 15       # Sobol base samples; evaluations = N_BASE * (inputs + 2)
+CHUNK_SIZE = 20_000
+
+
+def _column(value):
+    return np.asarray(value, dtype=float).reshape(-1, 1)
+
+
+def _log_capacity(t, start, power_growth, grid_limit, efficiency):
+    """log effective capacity at elapsed years t, shape (n, len(t))."""
+    power = np.minimum(t * np.log1p(_column(power_growth)), np.log(_column(grid_limit)))
+    return np.log(_column(start)) + power + t * np.log1p(_column(efficiency))
+
+
+@traced()
+def capacity(years, **params):
+    """(us, china) effective compute index over years, each (n, len(years))."""
+    p = {**DEFAULTS, **params}
+    t = np.asarray(years, dtype=float) - BASE_YEAR
+    us = _log_capacity(t, US_BASE, p['us_power_growth'], p['us_grid_limit'], p['us_efficiency'])
+    china = _log_capacity(t, US_BASE * _column(p['china_start']), p['china_power_growth'],
+                          p['china_grid_limit'], p['china_efficiency'])
+    return np.exp(us), np.exp(china)
+
+
+def parity_year(**params):
+    """
+    Interpolated year China's capacity first reaches the US, per parameter set;
+    each keyword in DEFAULTS may be a scalar or a 1-D array (arrays must share
+    one length). Parity after the horizon is reported as TIMES[-1]
+    """
+    p = {**DEFAULTS, **params}
+    t = TIMES - BASE_YEAR
+    gap = (_log_capacity(t, US_BASE * _column(p['china_start']), p['china_power_growth'],
+                         p['china_grid_limit'], p['china_efficiency'])
+           - _log_capacity(t, US_BASE, p['us_power_growth'], p['us_grid_limit'], p['us_efficiency']))
+    crossed = gap >= 0
+    step = crossed.argmax(axis=1)
+    rows = np.arange(gap.shape[0])
+    before = gap[rows, np.maximum(step - 1, 0)]
+    after = gap[rows, step]
+    frac = np.where(step > 0, np.clip(-before / np.where(after > before, after - before, 1), 0, 1), 0)
+    when = TIMES[np.maximum(step - 1, 0)] + frac * np.where(step > 0, TIMES[1] - TIMES[0], 0)
+    return np.where(crossed.any(axis=1), when, TIMES[-1])
+
+
+def _evaluate_chunk(samples):
+    """Parity years for a chunk of samples, shape (n, inputs) in RANGES order."""
+    return parity_year(**dict(zip(RANGES, samples.T)))
+
+
+def evaluate(samples, jobs=None, chunk_size=CHUNK_SIZE):
+    """Parity years for many samples, chunked over a process pool (jobs=1 runs in-process)."""
+    chunks = [samples[i:i + chunk_size] for i in range(0, len(samples), chunk_size)]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(chunks) == 1:
+        return np.concatenate([_evaluate_chunk(c) for c in chunks])
+    # Imported here: concurrent.futures.process costs more to import than the models
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+        return np.concatenate(list(pool.map(_evaluate_chunk, chunks)))
+
+
+def one_at_a_time():
+    """{input: (parity at low end, parity at high end)} with every other input at DEFAULTS."""
+    central = float(parity_year()[0])
+    swings = {}
+    for name, (lo, hi) in RANGES.items():
+        swings[name] = tuple(float(y) for y in parity_year(**{name: np.array([lo, hi])}))
+    return central, swings
+
+
+def sobol(n_base=N_BASE, seed=SEED, jobs=None, chunk_size=CHUNK_SIZE):
+    """
+    Variance-based (Sobol) indices from a Saltelli design of n_base * (inputs + 2)
+    evaluations: first-order S1 (Saltelli 2010) and total-order ST (Jansen)
+    Returns ({input: (S1, ST)}, parity years of the A sample)
+    """
+    names = list(RANGES)
+    k = len(names)
+    lo = np.array([RANGES[name][0] for name in names])
+    hi = np.array([RANGES[name][1] for name in names])
+    unit = np.random.default_rng(seed).random((n_base, 2 * k))
+    a = lo + unit[:, :k] * (hi - lo)
+    b = lo + unit[:, k:] * (hi - lo)
+    ab = np.repeat(a[None], k, axis=0)
+    ab[np.arange(k), :, np.arange(k)] = b.T
+
+    y = evaluate(np.concatenate([a, b, ab.reshape(-1, k)]), jobs, chunk_size)
+    years = y[:n_base].copy()
+    # Centre the outputs: the estimators are unstable for a large mean (~2030)
+    y = y - y[:2 * n_base].mean()
+    y_a, y_b, y_ab = y[:n_base], y[n_base:2 * n_base], y[2 * n_base:].reshape(k, n_base)
+    var = np.var(y[:2 * n_base])
+    first = np.mean(y_b * (y_ab - y_a), axis=1) / var
+    total = 0.5 * np.mean((y_a - y_ab) ** 2, axis=1) / var
+    return {name: (float(s1), float(st)) for name, s1, st in zip(names, first, total)}, years
+
+
+def analyze(n_base=N_BASE, seed=SEED, jobs=None, chunk_size=CHUNK_SIZE):
+    """
+    Full analysis:
+      central      parity year under DEFAULTS
+      oat          {input: (low, high)} one-at-a-time parity years
+      sobol        {input: (S1, ST)}
+      p5, p50, p95 percentiles of the parity year over RANGES
+      evaluations  number of model evaluations
+    """
+    central, oat = one_at_a_time()
+    indices, years = sobol(n_base, seed, jobs, chunk_size)
+    p5, p50, p95 = np.percentile(years, [5, 50, 95])
+    return {
+        'central': central,
+        'oat': oat,
+        'sobol': indices,
+        'p5': p5,
+        'p50': p50,
+        'p95': p95,
+        'evaluations': n_base * (len(RANGES) + 2) + 2 * len(RANGES) + 1,
+    }
+
+
+@traced()
+@functools.lru_cache(maxsize=None)
+def baseline():
+    """Analysis with the default settings, shared by the charts and the PDF (do not modify)."""
+    # In-process: charts may already be rendering inside build.py's worker pool
+    return analyze(jobs=1)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Sensitivity of the US-China compute parity year')
+    parser.add_argument('-n', '--samples', type=int, default=N_BASE, help='Sobol base samples')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: all CPUs)')
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = analyze(args.samples, args.seed, args.jobs, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    print(f"{result['evaluations']:,} model evaluations in {elapsed:.2f}s")
+    print(f"Central parity year: {result['central']:.1f}  "
+          f"(5-95% over ranges: {result['p5']:.1f}-{result['p95']:.1f})")
+    print(f"{'Input':<26}{'low':>8}{'high':>8}{'swing':>8}{'S1':>8}{'ST':>8}")
+    for name, (low, high) in sorted(result['oat'].items(), key=lambda kv: -abs(kv[1][1] - kv[1][0])):
+        s1, st = result['sobol'][name]
+        print(f"{LABELS[name]:<26}{low:8.1f}{high:8.1f}{abs(high - low):8.1f}{s1:8.2f}{st:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
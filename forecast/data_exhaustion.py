@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Data-exhaustion crossover finder: when does cumulative training consumption
+overtake the stock of high-quality text?
+Supply and demand are evaluated for every assumption set at once and the
+crossover date is interpolated between yearly steps; 1M+ combinations run in
+fixed-size chunks so memory stays flat
+"""
+import functools
+import time
+
+import numpy as np
+
+from forecast import scenarios
+from forecast.profiling import traced
+
+YEARS = np.arange(2018, 2041)
+BASE_YEAR = 2025
+
+# Cumulative tokens used by AI training (trillions), 2018 through BASE_YEAR
+HISTORICAL_CONSUMPTION = np.array([0.1, 0.5, 2, 4, 6, 9, 13, 14.5])
+TOTAL_STOCK = 22.5  # All internet text in BASE_YEAR (trillions)
+
+# Central assumptions drawn in data_timeline.png
+DEFAULTS = dict(
+    stock=10.1,          # high-quality text available in BASE_YEAR (trillions)
+    annual_new=1.5,      # new internet text per year (trillions)
+    hq_fraction=0.2,     # share of new text that is high quality
+    demand=1.0,          # training consumption in the year after BASE_YEAR (trillions)
+    demand_growth=0.0,   # annual growth of that consumption
+)
+
+# Sensitivity ranges; the stock and new-content ranges are the Section 8 figures
+RANGES = dict(
+    stock=(10, 15),
+    annual_new=(1, 2),
+    hq_fraction=(0.1, 0.3),
+    demand_growth=(0.0, 0.5),
+)
+POINTS_PER_AXIS = 32   # 32^4 ~ 1M combinations
+CHUNK_SIZE = 100_000
+
+
+def _column(value):
+    return np.asarray(value, dtype=float).reshape(-1, 1)
+
+
+@traced()
+def consumption(years, demand=DEFAULTS['demand'], demand_growth=DEFAULTS['demand_growth']):
+    """Cumulative training consumption (n, len(years)): history, then compounding annual demand."""
+    years = np.asarray(years)
+    k = np.maximum(years - BASE_YEAR, 0)
+    growth = _column(demand_growth)
+    # Sum of demand * (1 + g)^(j-1) for j = 1..k, with the g -> 0 limit
+    safe = np.where(growth == 0, 1, growth)
+    future = _column(demand) * np.where(growth == 0, k, ((1 + growth) ** k - 1) / safe)
+    past = HISTORICAL_CONSUMPTION[np.clip(years - YEARS[0], 0, HISTORICAL_CONSUMPTION.size - 1)]
+    return past + future
+
+
+@traced()
+def supply(years, stock=DEFAULTS['stock'], annual_new=DEFAULTS['annual_new'],
+           hq_fraction=DEFAULTS['hq_fraction']):
+    """High-quality text available (n, len(years)), growing linearly with new content."""
+    years = np.asarray(years)
+    return _column(stock) + _column(annual_new) * _column(hq_fraction) * (years - BASE_YEAR)
+
+
+@traced()
+def total_text(years, annual_new=DEFAULTS['annual_new']):
+    """All internet text (n, len(years))."""
+    return TOTAL_STOCK + _column(annual_new) * (np.asarray(years) - BASE_YEAR)
+
+
+def crossover(years, demand, supply):
+    """
+    Interpolated year at which demand first reaches supply, per row;
+    years[0] if it already has, inf if it does not within the horizon
+    """
+    gap = demand - supply
+    crossed = gap >= 0
+    hit = crossed.any(axis=1)
+    step = crossed.argmax(axis=1)
+    rows = np.arange(gap.shape[0])
+    before = gap[rows, np.maximum(step - 1, 0)]
+    after = gap[rows, step]
+    rise = np.where(after > before, after - before, 1)
+    frac = np.where(step > 0, np.clip(-before / rise, 0, 1), 0)
+    when = years[np.maximum(step - 1, 0)] + frac * np.where(step > 0, np.diff(years, prepend=years[0])[step], 0)
+    return np.where(hit, when, np.inf)
+
+
+def exhaustion_dates(years=YEARS, chunk_size=CHUNK_SIZE, **params):
+    """
+    Exhaustion date for every assumption set; each keyword in DEFAULTS may be
+    a scalar or a 1-D array (arrays must share one length)
+    """
+    p = {**DEFAULTS, **params}
+    n = max(np.size(v) for v in p.values())
+    p = {name: np.broadcast_to(np.asarray(v, dtype=float), (n,)) for name, v in p.items()}
+    dates = np.empty(n)
+    for start in range(0, n, chunk_size):
+        chunk = {name: v[start:start + chunk_size] for name, v in p.items()}
+        dates[start:start + chunk_size] = crossover(
+            years,
+            consumption(years, chunk['demand'], chunk['demand_growth']),
+            supply(years, chunk['stock'], chunk['annual_new'], chunk['hq_fraction']))
+    return dates
+
+
+def sensitivity(points=POINTS_PER_AXIS, chunk_size=CHUNK_SIZE):
+    """
+    Exhaustion dates over the full grid of RANGES, with summary statistics:
+      dates       exhaustion date per combination (inf = beyond the horizon)
+      central     date under DEFAULTS
+      p5, p50, p95 percentiles of the date distribution
+      beyond      share of combinations not exhausted by YEARS[-1]
+      historical  share exhausted by BASE_YEAR, on historical consumption alone
+                  (demand and its growth only apply after BASE_YEAR)
+    """
+    axes = {name: np.linspace(lo, hi, points) for name, (lo, hi) in RANGES.items()}
+    dates = exhaustion_dates(chunk_size=chunk_size, **scenarios.grid(**axes))
+    p5, p50, p95 = np.percentile(dates, [5, 50, 95])
+    return {
+        'dates': dates,
+        'n': dates.size,
+        'central': float(exhaustion_dates()[0]),
+        'p5': p5,
+        'p50': p50,
+        'p95': p95,
+        'beyond': float(np.mean(np.isinf(dates))),
+        'historical': float(np.mean(dates <= BASE_YEAR)),
+    }
+
+
+@traced()
+@functools.lru_cache(maxsize=None)
+def baseline():
+    """Grid results with the default settings, shared by the charts and the PDF (do not modify)."""
+    return sensitivity()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Distribution of high-quality data exhaustion dates')
+    parser.add_argument('--points', type=int, default=POINTS_PER_AXIS, help='grid points per axis')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = sensitivity(args.points, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    print(f"{result['n']:,} assumption sets in {elapsed:.2f}s")
+    print(f"  central assumptions: {result['central']:.1f}")
+    print(f"  median {result['p50']:.1f}  (5-95%: {result['p5']:.1f}-{result['p95']:.1f})")
+    print(f"  not exhausted by {YEARS[-1]}: {result['beyond']:.1%}")
+    print(f"  exhausted by {BASE_YEAR} on historical consumption: {result['historical']:.1%}")
+
+
+if __name__ == '__main__':
+    main()
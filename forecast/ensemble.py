@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Ensembles of perturbed trajectories for every projection, reduced to
+quantile bands for fan charts
+Each projection redraws its model inputs around their central values: the
+capability scenarios with the spreads agi_monte_carlo.py samples, the compute
+race over compute_parity.RANGES, training demand growth over
+data_exhaustion.RANGES, and market shares from a Dirichlet around the
+projected shares. Members are generated in fixed-size chunks; each chunk is
+reduced to its quantiles on a grid of LEVELS levels and merged into a
+running summary of the same size, so memory stays flat however many members
+are drawn and no chunk is kept in memory
+Given a store (see ensemble_store.py), chunks are also written to disk as
+they are drawn, and a later run with the same settings reads the stored
+summaries (memory-mapped) instead of drawing again
+"""
+import contextlib
+import functools
+import inspect
+import time
+
+import numpy as np
+
+from forecast import compute_parity, data_exhaustion, ensemble_store, scenarios
+from forecast.agi_monte_carlo import (CEILING_SIGMA, DECAY_SD, GROWTH_SD, LATE_GROWTH_SD, PLATEAU_GROWTH_SD,
+                                     RATE_SD)
+from forecast.profiling import traced
+
+SEED = 2026
+N_MEMBERS = 1_000_000
+CHUNK_SIZE = 100_000
+
+# Quantile levels kept per time step; a summary's rank error is about 1 / LEVELS
+LEVELS = 1001
+
+# Quantiles drawn in a fan: the 90% and 50% bands around the median
+BANDS = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Years of each projection, as drawn in its chart
+CAPABILITY_YEARS = np.arange(2026, 2037)
+COMPUTE_YEARS = np.arange(2026, 2034)
+CONSUMPTION_YEARS = np.arange(2018, 2036)
+
+# Members of each baseline ensemble kept in the store (its first chunk), for
+# charts of individual trajectories; the bands always use every member
+STORED_MEMBERS = CHUNK_SIZE
+
+# Dirichlet concentration of the market-share draws (higher = tighter around the projection)
+MARKET_CONCENTRATION = 50
+
+
+# ============================================
+# Streaming quantile summaries
+# ============================================
+def _at(ordered, q):
+    """Linearly interpolated quantiles q of rows sorted along axis 0 (as np.quantile's default)."""
+    pos = np.asarray(q) * (ordered.shape[0] - 1)
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, ordered.shape[0] - 1)
+    frac = (pos - lo)[:, None]
+    return ordered[lo] * (1 - frac) + ordered[hi] * frac
+
+
+def summarize(members, levels=LEVELS):
+    """Summary of a chunk of trajectories (n, steps): its quantiles at `levels` evenly spaced levels."""
+    # One sort serves every level; np.quantile would partition once per level
+    return {'count': members.shape[0], 'values': _at(np.sort(members, axis=0), np.linspace(0, 1, levels))}
+
+
+def merge(a, b):
+    """
+    Summary of the members behind two summaries, on the same levels: the
+    pooled CDF (each side interpolated between its levels, weighted by its
+    count) inverted at every level. Either side may be None
+    """
+    if a is None or b is None:
+        return a or b
+    levels = np.linspace(0, 1, a['values'].shape[0])
+    count = a['count'] + b['count']
+    values = np.empty_like(a['values'])
+    for j in range(values.shape[1]):
+        x = np.union1d(a['values'][:, j], b['values'][:, j])
+        cdf = (a['count'] * np.interp(x, a['values'][:, j], levels)
+               + b['count'] * np.interp(x, b['values'][:, j], levels)) / count
+        values[:, j] = np.interp(levels, cdf, x)
+    return {'count': count, 'values': values}
+
+
+def quantiles(summary, q=BANDS):
+    """Quantiles q of every time step, shape (len(q), steps)."""
+    return _at(summary['values'], q)
+
+
+# ============================================
+# Projections
+# ============================================
+def capability(rng, n, years=CAPABILITY_YEARS):
+    """The four capability scenarios with every growth parameter redrawn."""
+    t = np.asarray(years) - scenarios.BASE_YEAR
+    d = scenarios.DEFAULTS
+
+    def normal(name, sd):
+        return rng.normal(d[name], sd, size=n)
+
+    return {
+        'optimistic': scenarios.optimistic(t, normal('growth', GROWTH_SD)),
+        'moderate': scenarios.moderate(t, normal('growth', GROWTH_SD), normal('decay', DECAY_SD)),
+        'pessimistic': scenarios.pessimistic(t, d['ceiling'] * np.exp(rng.normal(0, CEILING_SIGMA, size=n)),
+                                             normal('rate', RATE_SD)),
+        'plateau': scenarios.plateau(t, d['plateau_years'], normal('plateau_growth', PLATEAU_GROWTH_SD),
+                                     normal('late_growth', LATE_GROWTH_SD)),
+    }
+
+
+def compute(rng, n, years=COMPUTE_YEARS):
+    """US and China effective compute with every input drawn uniformly over compute_parity.RANGES."""
+    params = {name: rng.uniform(lo, hi, size=n) for name, (lo, hi) in compute_parity.RANGES.items()}
+    us, china = compute_parity.capacity(years, **params)
+    return {'us': us, 'china': china}
+
+
+def consumption(rng, n, years=CONSUMPTION_YEARS):
+    """Cumulative training consumption with demand growth drawn uniformly over data_exhaustion.RANGES."""
+    lo, hi = data_exhaustion.RANGES['demand_growth']
+    return {'consumed': data_exhaustion.consumption(years, data_exhaustion.DEFAULTS['demand'],
+                                                    rng.uniform(lo, hi, size=n))}
+
+
+def market(rng, n, shares):
+    """
+    Market shares (%) per tier, redrawn each year from a Dirichlet around
+    `shares` ({tier: one share per year}); every member sums to 100
+    """
+    central = np.array(list(shares.values()), dtype=float)
+    central /= central.sum(axis=0)
+    draws = np.stack([rng.dirichlet(MARKET_CONCENTRATION * central[:, j], size=n)
+                      for j in range(central.shape[1])], axis=2)
+    return {tier: 100 * draws[:, i] for i, tier in enumerate(shares)}
+
+
+PROJECTIONS = {
+    'capability': capability,
+    'compute': compute,
+    'consumption': consumption,
+    'market': market,
+}
+
+
+def _years(draw, kwargs):
+    years = inspect.signature(draw).parameters.get('years')
+    return kwargs.get('years', years.default) if years else None
+
+
+def _result(n_members, seed, summaries, entry=None):
+    return {
+        'n_members': n_members,
+        'seed': seed,
+        'summaries': summaries,
+        'bands': {name: quantiles(summary) for name, summary in summaries.items()},
+        'entry': entry,
+    }
+
+
+def load(entry):
+    """Result of a stored ensemble (an ensemble_store entry), read from its memory-mapped summaries."""
+    return _result(entry['n_members'], entry['seed'],
+                   {name: ensemble_store.summary(entry, name) for name in entry['series']}, entry)
+
+
+def simulate(projection, n_members=N_MEMBERS, seed=SEED, chunk_size=CHUNK_SIZE, levels=LEVELS, store=None,
+             keep=None, **kwargs):
+    """
+    Stream an ensemble of one projection (a PROJECTIONS name; kwargs go to
+    its draw) through quantile summaries; returns a dict of results:
+      n_members, seed  as given
+      summaries        {series: summary}
+      bands            {series: quantiles at BANDS, shape (len(BANDS), steps)}
+      entry            its ensemble_store metadata, or None if not stored
+    Chunks draw from their own seeds, so results are reproducible for a
+    given seed and chunk_size. With a store directory, an ensemble already
+    stored is loaded instead; otherwise its chunks are written (the first
+    `keep` members, default all) as they are drawn
+    """
+    draw = PROJECTIONS[projection]
+    metadata = None
+    if store:
+        metadata = ensemble_store.describe(projection, kwargs, seed, n_members, chunk_size, levels,
+                                           ensemble_store.code_version(draw), _years(draw, kwargs))
+        stored = ensemble_store.entry(metadata['key'], store)
+        if stored:
+            return load(stored)
+    n_chunks = -(-n_members // chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    summaries = {}
+    output = ensemble_store.writer(metadata, keep, store) if store else contextlib.nullcontext((None, None))
+    with output as (append, finish):
+        for i in range(n_chunks):
+            size = min(chunk_size, n_members - i * chunk_size)
+            chunk = draw(np.random.default_rng(seeds[i]), size, **kwargs)
+            if append:
+                append(chunk)
+            for name, members in chunk.items():
+                summaries[name] = merge(summaries.get(name), summarize(members, levels))
+        if finish:
+            finish(summaries)
+    if store:
+        return load(ensemble_store.entry(metadata['key'], store))
+    return _result(n_members, seed, summaries)
+
+
+@traced()
+@functools.lru_cache(maxsize=None)
+def baseline(projection, shares=None):
+    """
+    Ensemble with the default settings, shared by the charts (do not modify);
+    for 'market', shares are the central shares as ((tier, (share per year)), ...)
+    Read from the default store when it holds one, else drawn and stored
+    """
+    return simulate(projection, store=ensemble_store.STORE_DIR, keep=STORED_MEMBERS,
+                    **({'shares': dict(shares)} if shares else {}))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Quantile bands of the capability, compute and data projections')
+    parser.add_argument('-n', '--members', type=int, default=N_MEMBERS)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--levels', type=int, default=LEVELS)
+    parser.add_argument('--store', help='write every member to this ensemble store, or read the ensembles '
+                                        'from it if already there')
+    args = parser.parse_args()
+
+    for projection, years in [('capability', CAPABILITY_YEARS), ('compute', COMPUTE_YEARS),
+                              ('consumption', CONSUMPTION_YEARS)]:
+        start = time.perf_counter()
+        result = simulate(projection, args.members, args.seed, args.chunk_size, args.levels, args.store)
+        print(f"{projection}: {args.members:,} members in {time.perf_counter() - start:.2f}s"
+              + (f" (stored as {result['entry']['key']})" if result['entry'] else ''))
+        for name, bands in result['bands'].items():
+            print(f"  {name:<12} {years[-1]}: median {bands[2, -1]:8.1f}  50%: {bands[1, -1]:.1f}-{bands[3, -1]:.1f}"
+                  f"  90%: {bands[0, -1]:.1f}-{bands[4, -1]:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+On-disk store of ensembles: members in chunked .npy files, quantile
+summaries, and a small metadata index
+An entry is one ensemble (projection, parameter set, seed, size) in its own
+directory: each series' members as one .npy file per chunk, appended as the
+chunks are drawn, its summary (quantiles on the summary levels), and an
+entry.json, written last, holding the metadata. An entry without entry.json
+is unfinished and never read. Arrays are opened memory-mapped, so a reader
+pulls in only the pages of the slices it asks for, and a repeated read is
+served from the page cache without copying. Members are stored
+column-major, so one year across every member is a contiguous read
+Publishing an entry removes the entries of its projection drawn by other
+code, then the least recently read entries beyond MAX_BYTES
+"""
+import contextlib
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import types
+
+import numpy as np
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.environ.get('LLM_FORECAST_ENSEMBLES', os.path.join(os.path.dirname(PACKAGE_DIR), '.ensembles'))
+ENTRY_FILE = 'entry.json'
+MAX_BYTES = 512 * 1024 * 1024
+
+
+def _jsonable(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def code_version(func):
+    """
+    Hash of a draw function's module source and the local modules and
+    constants it uses, so entries drawn by older code are not reused
+    """
+    module = inspect.getmodule(func)
+    h = hashlib.sha256(inspect.getsource(module).encode())
+    for name, value in sorted(vars(module).items()):
+        if isinstance(value, types.ModuleType):
+            path = getattr(value, '__file__', None)
+            if path and os.path.dirname(os.path.abspath(path)) == PACKAGE_DIR:
+                h.update(inspect.getsource(value).encode())
+        elif isinstance(value, (int, float, tuple)) and not name.startswith('__'):
+            h.update(f'{name}={value!r}'.encode())
+    return h.hexdigest()
+
+
+def describe(projection, params, seed, n_members, chunk_size, levels, code, years=None):
+    """Metadata of an entry, keyed by a hash of everything that determines its members."""
+    metadata = {
+        'projection': projection,
+        'params': _jsonable(params),
+        'seed': seed,
+        'n_members': n_members,
+        'chunk_size': chunk_size,
+        'levels': levels,
+        'code': code,
+    }
+    metadata['key'] = hashlib.sha256(json.dumps(metadata, sort_keys=True).encode()).hexdigest()[:32]
+    metadata['years'] = _jsonable(years)
+    return metadata
+
+
+def _write_file(path, write):
+    """write(file) to a temporary file beside path, then rename it into place."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    with os.fdopen(fd, 'wb') as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+# ============================================
+# Writing
+# ============================================
+@contextlib.contextmanager
+def writer(metadata, keep=None, store_dir=STORE_DIR, max_bytes=MAX_BYTES):
+    """
+    Context manager giving (append, finish) for a new entry described by
+    `metadata` (see describe). append(chunk) takes {series: members (n, steps)}
+    and writes each series' next chunk, up to `keep` members in all (default
+    every member); finish(summaries) writes {series: summary} and the
+    metadata, which publishes the entry and prunes the store (see evict).
+    An entry left unfinished (an exception, or no finish call) is removed
+    """
+    metadata = dict(metadata, stored_members=0, chunks=[])
+    n_members = metadata['n_members']
+    directory = os.path.join(store_dir, metadata['key'])
+    os.makedirs(directory, exist_ok=True)
+    done = {}
+
+    def append(chunk):
+        room = n_members if keep is None else keep - metadata['stored_members']
+        if room <= 0:
+            return
+        rows = 0
+        for series, members in chunk.items():
+            members = np.asfortranarray(members[:room])
+            rows = members.shape[0]
+            name = f"{series}.{len(metadata['chunks']):05d}.npy"
+            _write_file(os.path.join(directory, name), lambda f: np.save(f, members))
+        metadata['chunks'].append(rows)
+        metadata['stored_members'] += rows
+
+    def finish(summaries):
+        for series, summary in summaries.items():
+            _write_file(os.path.join(directory, f'{series}.summary.npy'),
+                        lambda f: np.save(f, summary['values']))
+        metadata['series'] = list(summaries)
+        metadata['steps'] = next(iter(summaries.values()))['values'].shape[1] if summaries else 0
+        _write_file(os.path.join(directory, ENTRY_FILE),
+                    lambda f: f.write(json.dumps(metadata, indent=1).encode()))
+        done['metadata'] = metadata
+        evict(store_dir, max_bytes, metadata)
+
+    try:
+        yield append, finish
+    finally:
+        if 'metadata' not in done and not os.path.exists(os.path.join(directory, ENTRY_FILE)):
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+# ============================================
+# Reading
+# ============================================
+def _read_entry(key, store_dir):
+    try:
+        with open(os.path.join(store_dir, key, ENTRY_FILE)) as f:
+            return dict(json.load(f), store_dir=store_dir)
+    except FileNotFoundError:
+        return None
+
+
+def entry(key, store_dir=STORE_DIR):
+    """Metadata of a finished entry, or None. A hit marks the entry as recently used."""
+    metadata = _read_entry(key, store_dir)
+    if metadata is not None:
+        os.utime(os.path.join(store_dir, key, ENTRY_FILE))
+    return metadata
+
+
+def index(store_dir=STORE_DIR, **criteria):
+    """Metadata of every finished entry, or of those whose fields equal `criteria` (e.g. projection, seed)."""
+    try:
+        keys = sorted(os.listdir(store_dir))
+    except FileNotFoundError:
+        return []
+    entries = (_read_entry(key, store_dir) for key in keys)
+    return [e for e in entries if e and all(e.get(name) == _jsonable(value) for name, value in criteria.items())]
+
+
+def _path(metadata, name):
+    return os.path.join(metadata['store_dir'], metadata['key'], name)
+
+
+def summary(metadata, series):
+    """The stored summary of one series, its values memory-mapped (as ensemble.summarize returns)."""
+    return {'count': metadata['n_members'],
+            'values': np.load(_path(metadata, f'{series}.summary.npy'), mmap_mode='r')}
+
+
+def chunks(metadata, series):
+    """Memory-mapped member chunks (n, steps) of one series, in order."""
+    return [np.load(_path(metadata, f'{series}.{i:05d}.npy'), mmap_mode='r')
+            for i in range(len(metadata['chunks']))]
+
+
+def members(metadata, series, start=0, stop=None, steps=slice(None)):
+    """
+    Stored members start:stop (default all) of one series at `steps` (a
+    slice or indices of the time steps). Only those pages are read; a
+    selection within one chunk is returned as a view of the file, and one
+    spanning chunks is copied into a new array
+    """
+    stop = metadata['stored_members'] if stop is None else min(stop, metadata['stored_members'])
+    parts, offset = [], 0
+    for chunk, rows in zip(chunks(metadata, series), metadata['chunks']):
+        lo, hi = max(start - offset, 0), min(stop - offset, rows)
+        if lo < hi:
+            parts.append(chunk[lo:hi, steps])
+        offset += rows
+    if len(parts) == 1:
+        return parts[0]
+    if not parts:
+        return np.empty((0, metadata['steps']))[:, steps]
+    return np.concatenate(parts)
+
+
+def remove(key, store_dir=STORE_DIR):
+    """Delete an entry and its files."""
+    shutil.rmtree(os.path.join(store_dir, key), ignore_errors=True)
+
+
+def _size(directory):
+    return sum(f.stat().st_size for f in os.scandir(directory) if f.is_file())
+
+
+def evict(store_dir=STORE_DIR, max_bytes=MAX_BYTES, current=None):
+    """
+    Remove the entries of current's projection drawn by other code (they are
+    never read again), then the least recently used entries beyond
+    max_bytes. The current entry and unfinished ones are kept
+    """
+    entries = []
+    for metadata in index(store_dir):
+        if metadata['key'] == (current or {}).get('key'):
+            continue
+        if current and metadata['projection'] == current['projection'] and metadata['code'] != current['code']:
+            remove(metadata['key'], store_dir)
+            continue
+        directory = os.path.join(store_dir, metadata['key'])
+        try:
+            entries.append((os.stat(os.path.join(directory, ENTRY_FILE)).st_mtime, _size(directory), metadata['key']))
+        except FileNotFoundError:
+            pass
+    total = sum(size for _, size, _ in entries)
+    if current:
+        total += _size(os.path.join(store_dir, current['key']))
+    for _, size, key in sorted(entries):
+        if total <= max_bytes:
+            break
+        remove(key, store_dir)
+        total -= size
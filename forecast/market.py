@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Market-tier projection: each deployment tier's share of the AI compute
+market by year, feeding the market projection charts and their ensemble
+"""
+import numpy as np
+
+YEARS = np.array([2024, 2026, 2028, 2030, 2032])
+TIERS = ['centralized_api', 'public_open', 'enterprise_private', 'sovereign_govt']
+LABELS = {
+    'centralized_api': 'Centralized API (current model)',
+    'public_open': 'Public/Open Models',
+    'enterprise_private': 'Enterprise Private',
+    'sovereign_govt': 'Sovereign/Government',
+}
+
+# Projected share of the market held by each tier (%), one value per year
+DEFAULTS = dict(
+    centralized_api=(85, 60, 35, 20, 10),
+    public_open=(5, 15, 20, 25, 30),
+    enterprise_private=(8, 18, 28, 32, 35),
+    sovereign_govt=(2, 7, 17, 23, 25),
+)
+
+
+def shares(**overrides):
+    """Market shares (%), shape (tiers, years) in TIERS order; keywords named after a tier replace its row."""
+    unknown = set(overrides) - set(TIERS)
+    if unknown:
+        raise TypeError(f"unknown tier: {', '.join(sorted(unknown))}")
+    return np.array([overrides.get(tier, DEFAULTS[tier]) for tier in TIERS], dtype=float)
+
+
+def main():
+    import argparse
+
+    argparse.ArgumentParser(description='Projected market share of each deployment tier').parse_args()
+    table = shares()
+    print(f"{'Tier':<34}" + ''.join(f'{year:>7}' for year in YEARS))
+    for tier, row in zip(TIERS, table):
+        print(f'{LABELS[tier]:<34}' + ''.join(f'{value:6.0f}%' for value in row))
+    print(f"{'Total':<34}" + ''.join(f'{value:6.0f}%' for value in table.sum(axis=0)))
+
+
+if __name__ == '__main__':
+    main()
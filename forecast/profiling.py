@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Opt-in tracing of the chart and PDF lifecycle
+  LLM_FORECAST_TRACE=trace.json   record spans (figure, data prep, artist
+                                  creation, layout, save, draw, encode) as a
+                                  Chrome trace; open it in Perfetto or
+                                  chrome://tracing
+  LLM_FORECAST_PROFILE=cprofile,tracemalloc
+                                  also write a cProfile dump and/or the top
+                                  allocations for every figure, next to the trace
+Both are read once at import. When they are unset span() returns a shared
+no-op context manager and traced() returns the function unchanged, so the
+instrumented code pays nothing
+Events are appended to the trace file one line at a time, so the worker
+processes of build.py can share one file; delete it to start a new trace
+"""
+import contextlib
+import functools
+import json
+import os
+import re
+import threading
+import time
+
+TRACE_FILE = os.environ.get('LLM_FORECAST_TRACE') or None
+PROFILE = set(filter(None, os.environ.get('LLM_FORECAST_PROFILE', '').split(',')))
+PROFILE_DIR = os.path.dirname(os.path.abspath(TRACE_FILE)) if TRACE_FILE else os.getcwd()
+TOP_ALLOCATIONS = 25
+
+_NULL = contextlib.nullcontext()
+_named_processes = set()
+
+
+def _emit(event):
+    """Append one trace event (JSON array format; the closing bracket is optional)."""
+    pid = os.getpid()
+    lines = []
+    if pid not in _named_processes:
+        _named_processes.add(pid)
+        lines.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': f'python {pid}'}})
+    lines.append(event)
+    fd = os.open(TRACE_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        if os.fstat(fd).st_size == 0:
+            os.write(fd, b'[\n')
+        os.write(fd, ''.join(json.dumps(line) + ',\n' for line in lines).encode())
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def _span(name, category, args):
+    start = time.monotonic_ns()
+    try:
+        yield args
+    finally:
+        _emit({'name': name, 'cat': category, 'ph': 'X', 'ts': start / 1000,
+               'dur': (time.monotonic_ns() - start) / 1000, 'pid': os.getpid(),
+               'tid': threading.get_ident(), 'args': args})
+
+
+def span(name, category='chart', **args):
+    """Context manager recording one span; the yielded dict can take extra args."""
+    if TRACE_FILE is None:
+        return _NULL
+    return _span(name, category, args)
+
+
+def traced(category='data prep'):
+    """Decorator recording a span per call, named module.function; a no-op unless tracing."""
+    def decorate(func):
+        if TRACE_FILE is None:
+            return func
+        name = f'{func.__module__}.{func.__name__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _span(name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _profile_path(name, suffix):
+    return os.path.join(PROFILE_DIR, re.sub(r'[^\w.-]', '_', os.path.splitext(name)[0]) + suffix)
+
+
+@contextlib.contextmanager
+def _figure(name):
+    # Only imported when profiling; they are slow to import and the models use this module
+    import cProfile
+    import tracemalloc
+
+    profiler = cProfile.Profile() if 'cprofile' in PROFILE else None
+    tracing_memory = 'tracemalloc' in PROFILE
+    started_tracemalloc = tracing_memory and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    if tracing_memory:
+        tracemalloc.reset_peak()
+    # Patched on the first traced figure, so importing the chart code never touches matplotlib
+    instrument_matplotlib()
+    with (_span(name, 'figure', {}) if TRACE_FILE else contextlib.nullcontext({})) as args:
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+                profiler.dump_stats(_profile_path(name, '.prof'))
+            if tracing_memory:
+                args['peak_traced_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+                stats = tracemalloc.take_snapshot().statistics('lineno')[:TOP_ALLOCATIONS]
+                with open(_profile_path(name, '.tracemalloc.txt'), 'w') as f:
+                    f.write(f"{name}: peak {args['peak_traced_mb']:.1f} MB traced\n")
+                    f.writelines(f'{stat}\n' for stat in stats)
+                if started_tracemalloc:
+                    tracemalloc.stop()
+
+
+def figure(name):
+    """Span around one figure's whole lifecycle, with the per-figure profiles if enabled."""
+    if TRACE_FILE is None and not PROFILE:
+        return _NULL
+    return _figure(name)
+
+
+def instrument_matplotlib():
+    """
+    Record spans for layout (tight_layout), the Agg draw (rasterizing the
+    figure) and encode (writing the PNG from the raster, or the SVG/PDF
+    file); a no-op unless tracing, and after the first call
+    """
+    if TRACE_FILE is None:
+        return
+    import matplotlib.image
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.backends.backend_pdf import FigureCanvasPdf
+    from matplotlib.backends.backend_svg import FigureCanvasSVG
+    from matplotlib.figure import Figure
+
+    for owner, attr, name, category in [(Figure, 'tight_layout', 'layout', 'layout'),
+                                        (FigureCanvasAgg, 'draw', 'draw', 'draw'),
+                                        (matplotlib.image, 'imsave', 'encode', 'encode'),
+                                        (FigureCanvasSVG, 'print_svg', 'encode', 'encode'),
+                                        (FigureCanvasPdf, 'print_pdf', 'encode', 'encode')]:
+        original = getattr(owner, attr)
+        if getattr(original, '_traced', False):
+            continue
+
+        def wrapper(*args, _original=original, _name=name, _category=category, **kwargs):
+            with _span(_name, _category, {}):
+                return _original(*args, **kwargs)
+        functools.update_wrapper(wrapper, original)
+        wrapper._traced = True
+        setattr(owner, attr, wrapper)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Vectorized capability-scenario engine for the scaling-limit projections
+Every curve family is evaluated over a 2-D grid of parameter sets x years in
+one array computation, so sweeping 100k+ parameter combinations is a single
+NumPy pass instead of one interpreted loop per combination
+"""
+import time
+
+import numpy as np
+
+from forecast.profiling import traced
+
+BASE_YEAR = 2026
+BASE_CAPABILITY = 124  # 2026 starting point on the capability index
+AGI_THRESHOLD = 500    # Hypothetical AGI threshold on the capability index
+
+SCENARIOS = ['optimistic', 'moderate', 'pessimistic', 'plateau']
+
+# Central parameters of the four scenarios drawn in scaling_limits.png
+DEFAULTS = dict(
+    growth=0.25,          # optimistic/moderate: initial annual growth
+    decay=0.017,          # moderate: growth lost per year (25% -> ~8% over a decade)
+    ceiling=180,          # pessimistic: hard capability ceiling
+    rate=0.15,            # pessimistic: asymptotic rate of approach to the ceiling
+    plateau_years=2,      # plateau: years of growth before stagnation
+    plateau_growth=0.15,  # plateau: growth before stagnation
+    late_growth=0.02,     # plateau: growth after stagnation
+)
+
+
+def _column(value):
+    """Parameter values as an (n, 1) column that broadcasts against years."""
+    return np.asarray(value, dtype=float).reshape(-1, 1)
+
+
+def optimistic(t, growth):
+    """Scaling continues: constant compound growth."""
+    return BASE_CAPABILITY * (1 + _column(growth)) ** t
+
+
+def moderate(t, growth, decay):
+    """
+    Moore's-law style slowdown: growth falls linearly by `decay` each year
+    Value at year t is the product of (1 + growth - decay * k) for k = 1..t,
+    so t must be whole years from BASE_YEAR on
+    """
+    t = np.asarray(t)
+    if np.any(t < 0) or np.any(t != np.round(t)):
+        raise ValueError(f"moderate() needs whole years since {BASE_YEAR}, got t = {t.tolist()}")
+    t = t.astype(int)
+    k = np.arange(1, int(t.max()) + 1)
+    log_steps = np.log1p(_column(growth) - _column(decay) * k)
+    log_cum = np.concatenate([np.zeros((log_steps.shape[0], 1)), np.cumsum(log_steps, axis=1)], axis=1)
+    return BASE_CAPABILITY * np.exp(log_cum[:, t])
+
+
+def pessimistic(t, ceiling, rate):
+    """Hard ceiling: asymptotic approach from the base capability."""
+    ceiling = _column(ceiling)
+    return ceiling - (ceiling - BASE_CAPABILITY) * np.exp(-_column(rate) * t)
+
+
+def plateau(t, plateau_years, plateau_growth, late_growth):
+    """Brief gains for `plateau_years`, then near-stagnation."""
+    plateau_years = _column(plateau_years)
+    early = (1 + _column(plateau_growth)) ** np.minimum(t, plateau_years)
+    late = (1 + _column(late_growth)) ** np.maximum(t - plateau_years, 0)
+    return BASE_CAPABILITY * early * late
+
+
+@traced()
+def evaluate(years, **params):
+    """
+    Evaluate all four scenario families for every parameter set
+    Each keyword in DEFAULTS may be a scalar or a 1-D array of length n
+    (arrays must share one length); returns {scenario: (n, len(years)) array}
+    """
+    p = {**DEFAULTS, **params}
+    t = np.asarray(years) - BASE_YEAR
+    n = max(np.size(v) for v in p.values())
+    p = {name: np.broadcast_to(np.asarray(v, dtype=float), (n,)) for name, v in p.items()}
+    return {
+        'optimistic': optimistic(t, p['growth']),
+        'moderate': moderate(t, p['growth'], p['decay']),
+        'pessimistic': pessimistic(t, p['ceiling'], p['rate']),
+        'plateau': plateau(t, p['plateau_years'], p['plateau_growth'], p['late_growth']),
+    }
+
+
+def grid(**axes):
+    """Cartesian product of parameter axes, flattened to 1-D arrays for evaluate()."""
+    mesh = np.meshgrid(*[np.asarray(v, dtype=float) for v in axes.values()], indexing='ij')
+    return {name: m.ravel() for name, m in zip(axes, mesh)}
+
+
+@traced()
+def moores_law(years, start_year=1970, start_count=2000, doubling=2, slow_year=2010, slow_doubling=3):
+    """Transistors per chip: doubling every `doubling` years, then every `slow_doubling` after slow_year."""
+    years = np.asarray(years, dtype=float)
+    at_slow = start_count * 2 ** ((slow_year - start_year) / doubling)
+    return np.where(years <= slow_year,
+                    start_count * 2 ** ((years - start_year) / doubling),
+                    at_slow * 2 ** ((years - slow_year) / slow_doubling))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Stress-test the 2036 capability outcomes')
+    parser.add_argument('-n', '--combinations', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # Random sweep around the central parameters
+    rng = np.random.default_rng(args.seed)
+    n = args.combinations
+    params = dict(
+        growth=rng.uniform(0.10, 0.40, n),
+        decay=rng.uniform(0.0, 0.03, n),
+        ceiling=rng.uniform(140, 400, n),
+        rate=rng.uniform(0.05, 0.30, n),
+        plateau_years=rng.integers(1, 6, n),
+    )
+    years = np.arange(BASE_YEAR, 2037)
+
+    start = time.perf_counter()
+    curves = evaluate(years, **params)
+    elapsed = time.perf_counter() - start
+
+    print(f"{n:,} parameter sets x {years.size} years in {elapsed * 1000:.1f} ms")
+    for name in SCENARIOS:
+        final = curves[name][:, -1]
+        lo, mid, hi = np.percentile(final, [5, 50, 95])
+        print(f"  {name:<12} 2036: median {mid:6.0f}  (5-95%: {lo:.0f}-{hi:.0f})  "
+              f"P(>= AGI threshold) {np.mean(final >= AGI_THRESHOLD):.1%}")
+
+
+if __name__ == '__main__':
+    main()
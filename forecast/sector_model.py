@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Array-backed sector deployment model: sectors x years x deployment mode,
+plus each sector's weight in the market
+One structure feeds the sector pies, the sector bars and the PDF table;
+interpolation to monthly or quarterly resolution is a single vectorized
+pass over every sector and mode
+"""
+import time
+
+import numpy as np
+
+from forecast.profiling import traced
+
+SECTORS = ['Public', 'Government', 'Corporate']
+SHORT_NAMES = ['Public', 'Govt', 'Corp']
+MODES = ['Cloud', 'Local']
+YEARS = np.array([2026, 2027, 2028, 2029])
+
+# Share of each sector's AI deployment by mode (%), shape (sectors, years, modes)
+SHARES = np.array([
+    [[75, 25], [60, 40], [45, 55], [35, 65]],   # Public
+    [[40, 60], [30, 70], [15, 85], [10, 90]],   # Government
+    [[65, 35], [50, 50], [35, 65], [25, 75]],   # Corporate
+], dtype=float)
+
+# Share of the overall AI market held by each sector (%), shape (sectors, years)
+MARKET_WEIGHTS = np.array([
+    [25, 25, 25, 25],   # Public
+    [20, 20, 20, 20],   # Government
+    [55, 55, 55, 55],   # Corporate
+], dtype=float)
+
+TRENDS = ['Cloud dominant', 'Transition begins', 'Local majority', 'Local dominant']
+
+
+def load(**weights):
+    """
+    The sector model as one structure of aligned arrays; keywords named after
+    a sector (public=30, government=..., corporate=...) set its market weight
+    (%) in every year
+    """
+    market_weights = MARKET_WEIGHTS.copy()
+    for name, weight in weights.items():
+        if name.capitalize() not in SECTORS:
+            raise TypeError(f"unknown sector: {name}")
+        market_weights[SECTORS.index(name.capitalize())] = weight
+    return {
+        'sectors': list(SECTORS),
+        'short_names': list(SHORT_NAMES),
+        'modes': list(MODES),
+        'years': YEARS.astype(float),
+        'shares': SHARES,
+        'weights': market_weights,
+        'trends': list(TRENDS),
+    }
+
+
+def interpolate(model, times):
+    """
+    Linearly interpolate shares (sectors, times, modes) and weights
+    (sectors, times) to arbitrary times, clamped to the modelled years
+    """
+    years = model['years']
+    times = np.clip(np.asarray(times, dtype=float), years[0], years[-1])
+    hi = np.clip(np.searchsorted(years, times, side='right'), 1, years.size - 1)
+    lo = hi - 1
+    frac = (times - years[lo]) / (years[hi] - years[lo])
+    shares = model['shares'][:, lo] + frac[None, :, None] * (model['shares'][:, hi] - model['shares'][:, lo])
+    weights = model['weights'][:, lo] + frac[None, :] * (model['weights'][:, hi] - model['weights'][:, lo])
+    return shares, weights
+
+
+@traced()
+def evaluate(model, times=None):
+    """
+    Evaluate the model at `times` (default: the modelled years) in one pass:
+      shares   % of each sector by mode, (sectors, times, modes)
+      weights  % of the market held by each sector, (sectors, times)
+      market   % of the whole market per sector and mode, (sectors, times, modes)
+      by_mode  % of the whole market per mode, (times, modes)
+    """
+    times = model['years'] if times is None else np.asarray(times, dtype=float)
+    shares, weights = interpolate(model, times)
+    market = weights[..., None] * shares / 100
+    return {
+        'times': times,
+        'shares': shares,
+        'weights': weights,
+        'market': market,
+        'by_mode': market.sum(axis=0),
+    }
+
+
+def monthly(model):
+    """Times at monthly resolution across the modelled years."""
+    return model['years'][0] + np.arange(int(round((model['years'][-1] - model['years'][0]) * 12)) + 1) / 12
+
+
+def quarterly(model):
+    """Times at quarterly resolution across the modelled years."""
+    return model['years'][0] + np.arange(int(round((model['years'][-1] - model['years'][0]) * 4)) + 1) / 4
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Monthly cloud vs local market share')
+    parser.add_argument('--sectors', type=int, default=0,
+                        help='time a synthetic model with this many sectors instead')
+    args = parser.parse_args()
+
+    model = load()
+    if args.sectors:
+        rng = np.random.default_rng(0)
+        cloud = np.sort(rng.uniform(5, 95, size=(args.sectors, YEARS.size)), axis=1)[:, ::-1]
+        model['shares'] = np.stack([cloud, 100 - cloud], axis=-1)
+        model['weights'] = np.repeat(rng.dirichlet(np.ones(args.sectors))[:, None] * 100, YEARS.size, axis=1)
+
+    start = time.perf_counter()
+    result = evaluate(model, monthly(model))
+    elapsed = time.perf_counter() - start
+
+    print(f"{model['shares'].shape[0]:,} sectors x {result['times'].size} months in {elapsed * 1000:.1f} ms")
+    for t, (cloud, local) in zip(result['times'][::6], result['by_mode'][::6]):
+        print(f"  {t:7.2f}  cloud {cloud:5.1f}%  local {local:5.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,175 +6,291 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 
-fig = plt.figure(figsize=(16, 12))
+from figures import fan, write_chart
+from forecast import data_exhaustion, ensemble, model_collapse
+
+
+def plot_data_wall():
+    fig = plt.figure(figsize=(16, 12))
+
+    # ============================================
+    # PLOT 1: Data availability vs Model requirements
+    # ============================================
+    ax1 = fig.add_subplot(2, 2, 1)
+
+    models = ['GPT-2\n(2019)', 'GPT-3\n(2020)', 'GPT-4\n(2023)', 'GPT-5?\n(2025)', 'GPT-6?\n(2027)', 'AGI?\n(2030)']
+    tokens_required = [10, 300, 13000, 50000, 200000, 1000000]  # Billions of tokens
+    x_pos = np.arange(len(models))
+
+    # Available data
+    total_internet_text = 15000  # ~15 trillion tokens
+    annual_new_content = 1500    # ~1.5 trillion/year
+
+    bars = ax1.bar(x_pos, tokens_required, color=['green', 'green', 'green', 'orange', 'red', 'darkred'],
+                   edgecolor='black', linewidth=1.5)
+
+    # Horizontal line for available data
+    ax1.axhline(y=total_internet_text, color='blue', linestyle='--', linewidth=3, label='Total Internet Text (~15T tokens)')
+    ax1.axhline(y=total_internet_text + 5*annual_new_content, color='lightblue', linestyle=':', linewidth=2,
+                label='+ 5 years new content')
+
+    ax1.set_xticks(x_pos)
+    ax1.set_xticklabels(models)
+    ax1.set_ylabel('Training Tokens Required (Billions)', fontsize=11)
+    ax1.set_title('The Data Wall: Model Requirements vs Available Data', fontsize=12, fontweight='bold')
+    ax1.set_yscale('log')
+    ax1.set_ylim(1, 2000000)
+    ax1.legend(loc='upper left', fontsize=9)
+
+    # Annotations
+    ax1.annotate('DATA\nEXHAUSTED', xy=(3, 50000), xytext=(3.5, 150000),
+                fontsize=12, fontweight='bold', color='red', ha='center')
+
+    # ============================================
+    # PLOT 2: Data sources breakdown
+    # ============================================
+    ax2 = fig.add_subplot(2, 2, 2)
+
+    sources = ['Common Crawl\n(web)', 'Books\n(scanned)', 'Wikipedia', 'Code\n(GitHub)', 'Scientific\nPapers',
+               'Reddit/Forums', 'News\nArchives', 'Other']
+    tokens = [10000, 2000, 100, 1000, 500, 800, 400, 200]  # Billions
+    used_pct = [95, 80, 100, 90, 70, 85, 60, 50]  # Percent already used
+
+    colors = plt.cm.RdYlGn([1 - u/100 for u in used_pct])
+
+    bars = ax2.barh(sources, tokens, color=colors, edgecolor='black', linewidth=1)
+
+    # Add percentage labels
+    for bar, pct in zip(bars, used_pct):
+        width = bar.get_width()
+        ax2.text(width + 100, bar.get_y() + bar.get_height()/2,
+                 f'{pct}% used', va='center', fontsize=9, fontweight='bold',
+                 color='red' if pct > 80 else 'orange' if pct > 60 else 'green')
+
+    ax2.set_xlabel('Available Tokens (Billions)', fontsize=11)
+    ax2.set_title('Training Data Sources: Already Exhausted', fontsize=12, fontweight='bold')
+    ax2.set_xlim(0, 12000)
+
+    # ============================================
+    # PLOT 3: Synthetic data problem
+    # ============================================
+    ax3 = fig.add_subplot(2, 2, 3)
+
+    generations = np.arange(0, 11)
+
+    # Model quality when training on synthetic data
+    quality = model_collapse.simulate(np.array([0.0, 0.1, 0.5, 0.9]), generations=generations[-1])
+    quality_no_synthetic = quality[0]  # Baseline stays flat
+    quality_10pct_synthetic = quality[1]  # 10% synthetic per generation
+    quality_50pct_synthetic = quality[2]  # 50% synthetic
+    quality_90pct_synthetic = quality[3]  # 90% synthetic
+
+    ax3.plot(generations, quality_no_synthetic, 'g-', linewidth=3, marker='o', label='0% synthetic (baseline)')
+    ax3.plot(generations, quality_10pct_synthetic, 'b-', linewidth=3, marker='s', label='10% synthetic/generation')
+    ax3.plot(generations, quality_50pct_synthetic, 'orange', linewidth=3, marker='^', label='50% synthetic/generation')
+    ax3.plot(generations, quality_90pct_synthetic, 'r-', linewidth=3, marker='x', label='90% synthetic/generation')
+
+    ax3.axhline(y=50, color='red', linestyle='--', linewidth=2, alpha=0.5)
+    ax3.text(10.2, 50, 'Unusable\nthreshold', fontsize=9, color='red', va='center')
+
+    ax3.set_xlabel('Training Generations', fontsize=11)
+    ax3.set_ylabel('Model Quality (%)', fontsize=11)
+    ax3.set_title('Model Collapse: Synthetic Data Degrades Quality', fontsize=12, fontweight='bold')
+    ax3.legend(loc='lower left', fontsize=9)
+    ax3.set_xlim(0, 10.5)
+    ax3.set_ylim(0, 110)
+    ax3.grid(True, alpha=0.3)
+
+    # ============================================
+    # PLOT 4: Alternative strategies comparison
+    # ============================================
+    ax4 = fig.add_subplot(2, 2, 4)
+
+    strategies = ['More\nCompute', 'Synthetic\nData', 'Licensed\nData', 'Multimodal', 'RLHF\nQuality',
+                  'Algorithmic\nBreakthrough']
+    effectiveness = [30, 25, 40, 50, 60, 95]
+    feasibility = [70, 60, 50, 65, 80, 20]
+    risk = [20, 80, 40, 30, 25, 10]
+
+    x = np.arange(len(strategies))
+    width = 0.25
+
+    bars1 = ax4.bar(x - width, effectiveness, width, label='Effectiveness', color='green', alpha=0.8)
+    bars2 = ax4.bar(x, feasibility, width, label='Feasibility', color='blue', alpha=0.8)
+    bars3 = ax4.bar(x + width, risk, width, label='Risk', color='red', alpha=0.8)
+
+    ax4.set_xticks(x)
+    ax4.set_xticklabels(strategies, fontsize=9)
+    ax4.set_ylabel('Score (0-100)', fontsize=11)
+    ax4.set_title('Post-Data-Wall Strategies: Effectiveness vs Feasibility vs Risk', fontsize=12, fontweight='bold')
+    ax4.legend(loc='upper right', fontsize=9)
+    ax4.set_ylim(0, 110)
+
+    # Highlight best option
+    ax4.annotate('Best path\nif achievable', xy=(5, 95), xytext=(4, 105),
+                arrowprops=dict(arrowstyle='->', color='green'), fontsize=9, color='green')
+
+    fig.tight_layout()
+    return fig
 
-# ============================================
-# PLOT 1: Data availability vs Model requirements
-# ============================================
-ax1 = fig.add_subplot(2, 2, 1)
-
-models = ['GPT-2\n(2019)', 'GPT-3\n(2020)', 'GPT-4\n(2023)', 'GPT-5?\n(2025)', 'GPT-6?\n(2027)', 'AGI?\n(2030)']
-tokens_required = [10, 300, 13000, 50000, 200000, 1000000]  # Billions of tokens
-x_pos = np.arange(len(models))
-
-# Available data
-total_internet_text = 15000  # ~15 trillion tokens
-annual_new_content = 1500    # ~1.5 trillion/year
-
-bars = ax1.bar(x_pos, tokens_required, color=['green', 'green', 'green', 'orange', 'red', 'darkred'],
-               edgecolor='black', linewidth=1.5)
-
-# Horizontal line for available data
-ax1.axhline(y=total_internet_text, color='blue', linestyle='--', linewidth=3, label='Total Internet Text (~15T tokens)')
-ax1.axhline(y=total_internet_text + 5*annual_new_content, color='lightblue', linestyle=':', linewidth=2,
-            label='+ 5 years new content')
-
-ax1.set_xticks(x_pos)
-ax1.set_xticklabels(models)
-ax1.set_ylabel('Training Tokens Required (Billions)', fontsize=11)
-ax1.set_title('The Data Wall: Model Requirements vs Available Data', fontsize=12, fontweight='bold')
-ax1.set_yscale('log')
-ax1.set_ylim(1, 2000000)
-ax1.legend(loc='upper left', fontsize=9)
 
-# Annotations
-ax1.annotate('DATA\nEXHAUSTED', xy=(3, 50000), xytext=(3.5, 150000),
-            fontsize=12, fontweight='bold', color='red', ha='center')
-
-# ============================================
-# PLOT 2: Data sources breakdown
 # ============================================
-ax2 = fig.add_subplot(2, 2, 2)
-
-sources = ['Common Crawl\n(web)', 'Books\n(scanned)', 'Wikipedia', 'Code\n(GitHub)', 'Scientific\nPapers',
-           'Reddit/Forums', 'News\nArchives', 'Other']
-tokens = [10000, 2000, 100, 1000, 500, 800, 400, 200]  # Billions
-used_pct = [95, 80, 100, 90, 70, 85, 60, 50]  # Percent already used
-
-colors = plt.cm.RdYlGn([1 - u/100 for u in used_pct])
-
-bars = ax2.barh(sources, tokens, color=colors, edgecolor='black', linewidth=1)
-
-# Add percentage labels
-for bar, pct in zip(bars, used_pct):
-    width = bar.get_width()
-    ax2.text(width + 100, bar.get_y() + bar.get_height()/2,
-             f'{pct}% used', va='center', fontsize=9, fontweight='bold',
-             color='red' if pct > 80 else 'orange' if pct > 60 else 'green')
-
-ax2.set_xlabel('Available Tokens (Billions)', fontsize=11)
-ax2.set_title('Training Data Sources: Already Exhausted', fontsize=12, fontweight='bold')
-ax2.set_xlim(0, 12000)
-
-# ============================================
-# PLOT 3: Synthetic data problem
+# Second Figure: Timeline of data exhaustion
 # ============================================
-ax3 = fig.add_subplot(2, 2, 3)
-
-generations = np.arange(0, 11)
-
-# Model quality when training on synthetic data
-quality_no_synthetic = np.ones(11) * 100  # Baseline stays flat
-quality_10pct_synthetic = 100 * (0.98 ** generations)  # 10% synthetic per generation
-quality_50pct_synthetic = 100 * (0.92 ** generations)  # 50% synthetic
-quality_90pct_synthetic = 100 * (0.80 ** generations)  # 90% synthetic
-
-ax3.plot(generations, quality_no_synthetic, 'g-', linewidth=3, marker='o', label='0% synthetic (baseline)')
-ax3.plot(generations, quality_10pct_synthetic, 'b-', linewidth=3, marker='s', label='10% synthetic/generation')
-ax3.plot(generations, quality_50pct_synthetic, 'orange', linewidth=3, marker='^', label='50% synthetic/generation')
-ax3.plot(generations, quality_90pct_synthetic, 'r-', linewidth=3, marker='x', label='90% synthetic/generation')
-
-ax3.axhline(y=50, color='red', linestyle='--', linewidth=2, alpha=0.5)
-ax3.text(10.2, 50, 'Unusable\nthreshold', fontsize=9, color='red', va='center')
+def plot_data_timeline(**params):
+    # Keyword arguments override data_exhaustion.DEFAULTS for the three curves
+    p = {**data_exhaustion.DEFAULTS, **params}
+    fig2, ax5 = plt.subplots(figsize=(14, 7))
+
+    years = np.arange(2018, 2036)
+
+    # Cumulative data used by AI training
+    data_consumed = data_exhaustion.consumption(years, p['demand'], p['demand_growth'])[0]
+
+    # Total available data (grows slowly)
+    total_available = data_exhaustion.total_text(years, p['annual_new'])[0]
+
+    # High quality data (subset)
+    high_quality = data_exhaustion.supply(years, p['stock'], p['annual_new'], p['hq_fraction'])[0]
+
+    ax5.fill_between(years, 0, total_available, alpha=0.3, color='blue', label='Total Internet Text')
+    ax5.fill_between(years, 0, high_quality, alpha=0.3, color='green', label='High-Quality Subset')
+    ax5.plot(years, data_consumed, 'r-', linewidth=4, marker='o', markersize=8, label='Cumulative AI Training Consumption')
+
+    # Mark key events
+    events = [
+        (2020, 2, 'GPT-3'),
+        (2023, 13, 'GPT-4'),
+        (2025, 15.5, 'Data wall hit'),
+    ]
+    for year, val, label in events:
+        ax5.annotate(label, xy=(year, val), xytext=(year-0.5, val+3),
+                    arrowprops=dict(arrowstyle='->', color='black'),
+                    fontsize=10, fontweight='bold')
+
+    # Crossover point: distribution over the assumption grid, which belongs to the defaults only
+    if all(np.array_equal(value, data_exhaustion.DEFAULTS[name]) for name, value in params.items()):
+        exhaustion = data_exhaustion.baseline()
+        ax5.axvspan(exhaustion['p5'], exhaustion['p95'], color='red', alpha=0.12)
+        ax5.axvline(x=exhaustion['p50'], color='red', linestyle='--', linewidth=2, alpha=0.7)
+        ax5.text(exhaustion['p95'] + 0.2, 5,
+                 f"HIGH-QUALITY\nDATA EXHAUSTED\n~{exhaustion['p50']:.0f} (90%: {exhaustion['p5']:.0f}-{exhaustion['p95']:.0f})",
+                 fontsize=11, color='red', fontweight='bold')
+
+        inset = ax5.inset_axes([0.66, 0.08, 0.3, 0.3])
+        finite = exhaustion['dates'][np.isfinite(exhaustion['dates'])]
+        inset.hist(finite, bins=20, color='red', alpha=0.6)
+        inset.set_title(f"Exhaustion date, {exhaustion['n']:,} assumption sets", fontsize=8)
+        inset.tick_params(labelsize=7)
+        inset.set_yticks([])
+    else:
+        date = float(data_exhaustion.exhaustion_dates(**params)[0])
+        if date <= years[-1]:
+            ax5.axvline(x=date, color='red', linestyle='--', linewidth=2, alpha=0.7)
+            ax5.text(date + 0.2, 5, f"HIGH-QUALITY\nDATA EXHAUSTED\n~{date:.0f}", fontsize=11, color='red',
+                     fontweight='bold')
+        else:
+            when = f"~{date:.0f}" if np.isfinite(date) else f"after {data_exhaustion.YEARS[-1]}"
+            ax5.text(years[-1] - 0.2, 5, f"HIGH-QUALITY\nDATA EXHAUSTED\n{when}", fontsize=11, color='red',
+                     fontweight='bold', ha='right')
+
+    ax5.set_xlabel('Year', fontsize=12)
+    ax5.set_ylabel('Tokens (Trillions)', fontsize=12)
+    ax5.set_title('The Data Exhaustion Timeline: When Does Training Data Run Out?', fontsize=14, fontweight='bold')
+    ax5.legend(loc='upper left', fontsize=10)
+    ax5.set_xlim(2018, 2035)
+    ax5.set_ylim(0, 35)
+    ax5.grid(True, alpha=0.3)
+
+    fig2.tight_layout()
+    return fig2
 
-ax3.set_xlabel('Training Generations', fontsize=11)
-ax3.set_ylabel('Model Quality (%)', fontsize=11)
-ax3.set_title('Model Collapse: Synthetic Data Degrades Quality', fontsize=12, fontweight='bold')
-ax3.legend(loc='lower left', fontsize=9)
-ax3.set_xlim(0, 10.5)
-ax3.set_ylim(0, 110)
-ax3.grid(True, alpha=0.3)
 
 # ============================================
-# PLOT 4: Alternative strategies comparison
+# Third Figure: Model-collapse threshold crossing
 # ============================================
-ax4 = fig.add_subplot(2, 2, 4)
+def plot_model_collapse(generations=50, resolution=200):
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
+
+    synthetic = np.linspace(0, 1, resolution)
+    other = np.linspace(0, 1, resolution)
+
+    # Rows: synthetic fraction; columns: filtering efficiency / fresh real-data share
+    by_filtering = model_collapse.crossing_generation(
+        model_collapse.simulate(synthetic[:, None], 0.0, other[None, :], generations))
+    by_fresh = model_collapse.crossing_generation(
+        model_collapse.simulate(synthetic[:, None], other[None, :] * 0.2, 0.0, generations))
+
+    cmap = plt.get_cmap('RdYlGn').copy()
+    cmap.set_over('darkgreen')
+    panels = [
+        (ax1, by_filtering, [0, 1], 'Filtering Efficiency (share of synthetic data removed)',
+         'No fresh real data'),
+        (ax2, by_fresh, [0, 20], 'Fresh Real Data per Generation (%)', 'No filtering'),
+    ]
+    for ax, crossing, xrange, xlabel, note in panels:
+        extent = [xrange[0], xrange[1], 0, 100]
+        im = ax.imshow(np.where(np.isfinite(crossing), crossing, generations + 1), origin='lower',
+                       aspect='auto', extent=extent, cmap=cmap, vmin=0, vmax=generations)
+        ax.contour(np.isfinite(crossing).astype(float), levels=[0.5], colors='black', linewidths=2,
+                   origin='lower', extent=extent)
+        ax.set_xlabel(xlabel, fontsize=11)
+        ax.set_ylabel('Synthetic Data per Generation (%)', fontsize=11)
+        ax.set_title(f'Generations Until Quality < {model_collapse.UNUSABLE_THRESHOLD}% ({note})',
+                     fontsize=12, fontweight='bold')
+        ax.text(0.97, 0.03, 'Dark green: never\ncrosses threshold', transform=ax.transAxes, fontsize=9,
+                ha='right', va='bottom', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+        fig.colorbar(im, ax=ax, extend='max', label=f'Generations (>{generations} = never)')
+
+    fig.tight_layout()
+    return fig
 
-strategies = ['More\nCompute', 'Synthetic\nData', 'Licensed\nData', 'Multimodal', 'RLHF\nQuality',
-              'Algorithmic\nBreakthrough']
-effectiveness = [30, 25, 40, 50, 60, 95]
-feasibility = [70, 60, 50, 65, 80, 20]
-risk = [20, 80, 40, 30, 25, 10]
-
-x = np.arange(len(strategies))
-width = 0.25
-
-bars1 = ax4.bar(x - width, effectiveness, width, label='Effectiveness', color='green', alpha=0.8)
-bars2 = ax4.bar(x, feasibility, width, label='Feasibility', color='blue', alpha=0.8)
-bars3 = ax4.bar(x + width, risk, width, label='Risk', color='red', alpha=0.8)
-
-ax4.set_xticks(x)
-ax4.set_xticklabels(strategies, fontsize=9)
-ax4.set_ylabel('Score (0-100)', fontsize=11)
-ax4.set_title('Post-Data-Wall Strategies: Effectiveness vs Feasibility vs Risk', fontsize=12, fontweight='bold')
-ax4.legend(loc='upper right', fontsize=9)
-ax4.set_ylim(0, 110)
-
-# Highlight best option
-ax4.annotate('Best path\nif achievable', xy=(5, 95), xytext=(4, 105),
-            arrowprops=dict(arrowstyle='->', color='green'), fontsize=9, color='green')
-
-plt.tight_layout()
-plt.savefig('/home/grs/Projects/adhoc/llm_forecast/data_wall.png', dpi=150, bbox_inches='tight',
-            facecolor='white', edgecolor='none')
-print("Chart saved: data_wall.png")
 
 # ============================================
-# Second Figure: Timeline of data exhaustion
+# Fourth Figure: Uncertainty of training consumption
 # ============================================
-fig2, ax5 = plt.subplots(figsize=(14, 7))
-
-years = np.arange(2018, 2036)
-
-# Cumulative data used by AI training
-data_consumed = [0.1, 0.5, 2, 4, 6, 9, 13, 14.5, 15.5, 16.5, 17.5, 18.5, 19.5, 20.5, 21.5, 22.5, 23.5, 24.5]
-
-# Total available data (grows slowly)
-total_available = [12 + (y - 2018) * 1.5 for y in years]
-
-# High quality data (subset)
-high_quality = [8 + (y - 2018) * 0.3 for y in years]
-
-ax5.fill_between(years, 0, total_available, alpha=0.3, color='blue', label='Total Internet Text')
-ax5.fill_between(years, 0, high_quality, alpha=0.3, color='green', label='High-Quality Subset')
-ax5.plot(years, data_consumed, 'r-', linewidth=4, marker='o', markersize=8, label='Cumulative AI Training Consumption')
-
-# Mark key events
-events = [
-    (2020, 2, 'GPT-3'),
-    (2023, 13, 'GPT-4'),
-    (2025, 15.5, 'Data wall hit'),
-]
-for year, val, label in events:
-    ax5.annotate(label, xy=(year, val), xytext=(year-0.5, val+3),
-                arrowprops=dict(arrowstyle='->', color='black'),
-                fontsize=10, fontweight='bold')
-
-# Crossover point
-ax5.axvline(x=2025, color='red', linestyle='--', linewidth=2, alpha=0.7)
-ax5.text(2025.2, 5, 'HIGH-QUALITY\nDATA EXHAUSTED', fontsize=11, color='red', fontweight='bold')
-
-ax5.set_xlabel('Year', fontsize=12)
-ax5.set_ylabel('Tokens (Trillions)', fontsize=12)
-ax5.set_title('The Data Exhaustion Timeline: When Does Training Data Run Out?', fontsize=14, fontweight='bold')
-ax5.legend(loc='upper left', fontsize=10)
-ax5.set_xlim(2018, 2035)
-ax5.set_ylim(0, 35)
-ax5.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('/home/grs/Projects/adhoc/llm_forecast/data_timeline.png', dpi=150, bbox_inches='tight',
-            facecolor='white', edgecolor='none')
-print("Chart saved: data_timeline.png")
-
-print("\nAll data wall charts generated successfully!")
+def plot_consumption_fan():
+    fig, ax = plt.subplots(figsize=(14, 7))
+    result = ensemble.baseline('consumption')
+    years = ensemble.CONSUMPTION_YEARS
+
+    ax.plot(years, data_exhaustion.total_text(years)[0], 'b--', linewidth=2, label='Total Internet Text')
+    ax.plot(years, data_exhaustion.supply(years)[0], 'g--', linewidth=2, label='High-Quality Subset')
+    fan(ax, years, result['bands']['consumed'], 'red', 'Cumulative AI Training Consumption (median)')
+
+    exhaustion = data_exhaustion.baseline()
+    ax.axvspan(exhaustion['p5'], exhaustion['p95'], color='red', alpha=0.08)
+    ax.text(exhaustion['p5'] + 0.1, 0.97, 'Exhaustion date\n(90% range)', fontsize=9, color='red',
+            va='top', transform=ax.get_xaxis_transform())
+
+    lo, hi = data_exhaustion.RANGES['demand_growth']
+    ax.set_xlabel('Year', fontsize=12)
+    ax.set_ylabel('Tokens (Trillions)', fontsize=12)
+    ax.set_title(f"Training Data Consumption with Uncertainty\n"
+                 f"({result['n_members']:,} draws of demand growth {lo:.0%}-{hi:.0%}/yr; "
+                 f"bands: 50% and 90%, line: median)", fontsize=14, fontweight='bold')
+    ax.legend(loc='upper left', fontsize=10)
+    ax.set_xlim(2018, 2035)
+    ax.set_ylim(bottom=0)
+    ax.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+FIGURES = {
+    'data_wall.png': plot_data_wall,
+    'data_timeline.png': plot_data_timeline,
+    'model_collapse.png': plot_model_collapse,
+    'data_consumption_fan.png': plot_consumption_fan,
+}
+
+
+def main():
+    for filename, plot in FIGURES.items():
+        write_chart(filename, plot)
+    print("\nAll data wall charts generated successfully!")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,111 +6,218 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 
-fig, axes = plt.subplots(1, 2, figsize=(16, 8))
-fig.suptitle('The Power Bottleneck: AI Compute Race 2026-2033', fontsize=16, fontweight='bold')
-
-# LEFT: Power requirements scaling
-ax1 = axes[0]
-categories = ['Current\nData Center', 'Next-Gen\nTraining', 'GPT-5 Class\nTraining', 'AGI-Scale\nFacility']
-power_mw = [75, 750, 150, 7500]  # MW
-colors = ['#4CAF50', '#FFC107', '#FF9800', '#F44336']
-
-bars = ax1.bar(categories, power_mw, color=colors, edgecolor='black', linewidth=1.5)
-ax1.set_ylabel('Power Requirement (MW)', fontsize=12)
-ax1.set_title('AI Compute Power Requirements\n(Escalating Dramatically)', fontsize=12, fontweight='bold')
-ax1.set_ylim(0, 9000)
-
-# Add reference lines
-ax1.axhline(y=1000, color='blue', linestyle='--', linewidth=2, alpha=0.7)
-ax1.text(3.5, 1200, '1 Nuclear Reactor (~1 GW)', fontsize=9, color='blue', ha='right')
-
-ax1.axhline(y=5000, color='purple', linestyle='--', linewidth=2, alpha=0.7)
-ax1.text(3.5, 5200, 'Entire City (~5 GW)', fontsize=9, color='purple', ha='right')
-
-# Add value labels on bars
-for bar, val in zip(bars, power_mw):
-    height = bar.get_height()
-    ax1.text(bar.get_x() + bar.get_width()/2., height + 150,
-             f'{val:,} MW', ha='center', va='bottom', fontsize=10, fontweight='bold')
-
-# RIGHT: China vs US timeline
-ax2 = axes[1]
-years = np.array([2026, 2027, 2028, 2029, 2030, 2031, 2032, 2033])
-
-# Compute availability index (arbitrary units representing effective AI compute capacity)
-us_compute = [100, 115, 125, 135, 145, 155, 165, 175]  # Efficiency gains but power limited
-china_compute = [70, 85, 110, 145, 190, 240, 300, 370]  # Power buildout accelerates
-
-ax2.plot(years, us_compute, 'b-o', linewidth=3, markersize=10, label='US/West (power-constrained)')
-ax2.plot(years, china_compute, 'r-s', linewidth=3, markersize=10, label='China (power-expanding)')
-
-# Mark crossover point
-crossover_year = 2029
-ax2.axvline(x=crossover_year, color='gray', linestyle='--', linewidth=2, alpha=0.7)
-ax2.text(crossover_year + 0.1, 50, 'Compute\nParity\n(~2029)', fontsize=9, ha='left', va='bottom')
-
-# Shaded regions
-ax2.fill_between(years, us_compute, alpha=0.3, color='blue')
-ax2.fill_between(years, china_compute, alpha=0.3, color='red')
-
-ax2.set_xlabel('Year', fontsize=12)
-ax2.set_ylabel('Effective AI Compute Capacity (Index)', fontsize=12)
-ax2.set_title('Projected AI Compute Race\n(If Power is the Bottleneck)', fontsize=12, fontweight='bold')
-ax2.legend(loc='upper left', fontsize=10)
-ax2.set_xlim(2025.5, 2033.5)
-ax2.set_ylim(0, 400)
-ax2.grid(True, alpha=0.3)
-
-# Add annotations
-ax2.annotate('China new power\nplants online', xy=(2029, 145), xytext=(2027.5, 200),
-            arrowprops=dict(arrowstyle='->', color='red'), fontsize=9, color='red')
-ax2.annotate('US grid\nconstraints', xy=(2028, 125), xytext=(2026.5, 160),
-            arrowprops=dict(arrowstyle='->', color='blue'), fontsize=9, color='blue')
-
-plt.tight_layout()
-plt.savefig('/home/grs/Projects/adhoc/llm_forecast/power_bottleneck.png', dpi=150, bbox_inches='tight',
-            facecolor='white', edgecolor='none')
-print("Chart saved: power_bottleneck.png")
-
-# Second figure: Comparison table as visual
-fig2, ax3 = plt.subplots(figsize=(12, 6))
-ax3.axis('off')
-
-table_data = [
-    ['Factor', 'China', 'US/West', 'Advantage'],
-    ['Permitting Speed', 'Months', '5-10 years', 'China'],
-    ['State Coordination', 'Central planning', 'Fragmented', 'China'],
-    ['Grid Buildout', 'Rapid expansion', 'Aging infrastructure', 'China'],
-    ['Nuclear Plans', '150+ reactors', 'Regulatory paralysis', 'China'],
-    ['Chip Technology', 'Behind (sanctions)', 'Leading edge', 'US'],
-    ['AI Talent', 'Growing fast', 'Still concentrated', 'US'],
-    ['Private Capital', 'State-directed', 'Abundant VC/tech', 'US'],
-    ['Allies', 'Limited', 'Japan/Taiwan/Korea/EU', 'US'],
-]
-
-colors_table = [['#1a237e', '#1a237e', '#1a237e', '#1a237e']]  # Header
-for row in table_data[1:]:
-    if row[3] == 'China':
-        colors_table.append(['white', '#ffcdd2', 'white', '#ffcdd2'])
+from figures import fan, write_chart
+from forecast import compute_parity, ensemble
+
+
+def plot_power_bottleneck(**params):
+    # Keyword arguments override compute_parity.DEFAULTS for the capacity curves
+    fig, axes = plt.subplots(1, 2, figsize=(16, 8))
+    fig.suptitle('The Power Bottleneck: AI Compute Race 2026-2033', fontsize=16, fontweight='bold')
+
+    # LEFT: Power requirements scaling
+    ax1 = axes[0]
+    categories = ['Current\nData Center', 'Next-Gen\nTraining', 'GPT-5 Class\nTraining', 'AGI-Scale\nFacility']
+    power_mw = [75, 750, 150, 7500]  # MW
+    colors = ['#4CAF50', '#FFC107', '#FF9800', '#F44336']
+
+    bars = ax1.bar(categories, power_mw, color=colors, edgecolor='black', linewidth=1.5)
+    ax1.set_ylabel('Power Requirement (MW)', fontsize=12)
+    ax1.set_title('AI Compute Power Requirements\n(Escalating Dramatically)', fontsize=12, fontweight='bold')
+    ax1.set_ylim(0, 9000)
+
+    # Add reference lines
+    ax1.axhline(y=1000, color='blue', linestyle='--', linewidth=2, alpha=0.7)
+    ax1.text(3.5, 1200, '1 Nuclear Reactor (~1 GW)', fontsize=9, color='blue', ha='right')
+
+    ax1.axhline(y=5000, color='purple', linestyle='--', linewidth=2, alpha=0.7)
+    ax1.text(3.5, 5200, 'Entire City (~5 GW)', fontsize=9, color='purple', ha='right')
+
+    # Add value labels on bars
+    for bar, val in zip(bars, power_mw):
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width()/2., height + 150,
+                 f'{val:,} MW', ha='center', va='bottom', fontsize=10, fontweight='bold')
+
+    # RIGHT: China vs US timeline
+    ax2 = axes[1]
+    years = np.array([2026, 2027, 2028, 2029, 2030, 2031, 2032, 2033])
+
+    # Compute availability index (arbitrary units representing effective AI compute capacity)
+    # US: efficiency gains but power limited; China: power buildout accelerates
+    us_compute, china_compute = (c[0] for c in compute_parity.capacity(years, **params))
+
+    ax2.plot(years, us_compute, 'b-o', linewidth=3, markersize=10, label='US/West (power-constrained)')
+    ax2.plot(years, china_compute, 'r-s', linewidth=3, markersize=10, label='China (power-expanding)')
+
+    # Mark crossover point; the 90% band over the sensitivity ranges belongs to the defaults only
+    if all(np.array_equal(value, compute_parity.DEFAULTS[name]) for name, value in params.items()):
+        parity = compute_parity.baseline()
+        crossover_year = parity['central']
+        ax2.axvspan(parity['p5'], parity['p95'], color='gray', alpha=0.1)
+    else:
+        crossover_year = float(compute_parity.parity_year(**params)[0])
+    if crossover_year <= years[-1]:
+        ax2.axvline(x=crossover_year, color='gray', linestyle='--', linewidth=2, alpha=0.7)
+        ax2.text(crossover_year + 0.1, 50, f'Compute\nParity\n(~{crossover_year:.0f})', fontsize=9, ha='left', va='bottom')
     else:
-        colors_table.append(['white', 'white', '#bbdefb', '#bbdefb'])
+        # Parity at the model horizon means no parity within it
+        when = (f'after {compute_parity.TIMES[-1]:.0f}' if crossover_year >= compute_parity.TIMES[-1]
+                else f'~{crossover_year:.0f}')
+        ax2.text(years[-1] + 0.4, 50, f'Compute\nParity\n({when})', fontsize=9, ha='right', va='bottom')
 
-table = ax3.table(cellText=table_data, cellLoc='center', loc='center',
-                  cellColours=colors_table)
-table.auto_set_font_size(False)
-table.set_fontsize(11)
-table.scale(1.2, 2)
+    # Shaded regions
+    ax2.fill_between(years, us_compute, alpha=0.3, color='blue')
+    ax2.fill_between(years, china_compute, alpha=0.3, color='red')
 
-# Style header
-for j in range(4):
-    table[(0, j)].set_text_props(color='white', fontweight='bold')
-    table[(0, j)].set_facecolor('#1a237e')
+    ax2.set_xlabel('Year', fontsize=12)
+    ax2.set_ylabel('Effective AI Compute Capacity (Index)', fontsize=12)
+    ax2.set_title('Projected AI Compute Race\n(If Power is the Bottleneck)', fontsize=12, fontweight='bold')
+    ax2.legend(loc='upper left', fontsize=10)
+    ax2.set_xlim(2025.5, 2033.5)
+    ax2.set_ylim(0, 400)
+    ax2.grid(True, alpha=0.3)
 
-ax3.set_title('China vs US: AI Infrastructure Comparison\n', fontsize=14, fontweight='bold')
+    # Add annotations
+    ax2.annotate('China new power\nplants online', xy=(2029, china_compute[3]), xytext=(2027.5, 200),
+                arrowprops=dict(arrowstyle='->', color='red'), fontsize=9, color='red')
+    ax2.annotate('US grid\nconstraints', xy=(2028, us_compute[2]), xytext=(2026.5, 160),
+                arrowprops=dict(arrowstyle='->', color='blue'), fontsize=9, color='blue')
 
-plt.tight_layout()
-plt.savefig('/home/grs/Projects/adhoc/llm_forecast/china_vs_us_comparison.png', dpi=150, bbox_inches='tight',
-            facecolor='white', edgecolor='none')
-print("Chart saved: china_vs_us_comparison.png")
+    fig.tight_layout()
+    return fig
 
-print("\nBoth power analysis charts generated successfully!")
+
+# Second figure: Comparison table as visual
+def plot_china_vs_us_comparison():
+    fig2, ax3 = plt.subplots(figsize=(12, 6))
+    ax3.axis('off')
+
+    table_data = [
+        ['Factor', 'China', 'US/West', 'Advantage'],
+        ['Permitting Speed', 'Months', '5-10 years', 'China'],
+        ['State Coordination', 'Central planning', 'Fragmented', 'China'],
+        ['Grid Buildout', 'Rapid expansion', 'Aging infrastructure', 'China'],
+        ['Nuclear Plans', '150+ reactors', 'Regulatory paralysis', 'China'],
+        ['Chip Technology', 'Behind (sanctions)', 'Leading edge', 'US'],
+        ['AI Talent', 'Growing fast', 'Still concentrated', 'US'],
+        ['Private Capital', 'State-directed', 'Abundant VC/tech', 'US'],
+        ['Allies', 'Limited', 'Japan/Taiwan/Korea/EU', 'US'],
+    ]
+
+    colors_table = [['#1a237e', '#1a237e', '#1a237e', '#1a237e']]  # Header
+    for row in table_data[1:]:
+        if row[3] == 'China':
+            colors_table.append(['white', '#ffcdd2', 'white', '#ffcdd2'])
+        else:
+            colors_table.append(['white', 'white', '#bbdefb', '#bbdefb'])
+
+    table = ax3.table(cellText=table_data, cellLoc='center', loc='center',
+                      cellColours=colors_table)
+    table.auto_set_font_size(False)
+    table.set_fontsize(11)
+    table.scale(1.2, 2)
+
+    # Style header
+    for j in range(4):
+        table[(0, j)].set_text_props(color='white', fontweight='bold')
+        table[(0, j)].set_facecolor('#1a237e')
+
+    ax3.set_title('China vs US: AI Infrastructure Comparison\n', fontsize=14, fontweight='bold')
+
+    fig2.tight_layout()
+    return fig2
+
+
+# Third figure: What moves the parity year
+def plot_parity_tornado():
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7), gridspec_kw=dict(width_ratios=[3, 2]))
+    parity = compute_parity.baseline()
+    central = parity['central']
+
+    # LEFT: one-at-a-time swings, largest at the top
+    order = sorted(parity['oat'], key=lambda name: abs(parity['oat'][name][1] - parity['oat'][name][0]))
+    labels = [compute_parity.LABELS[name] for name in order]
+    for i, name in enumerate(order):
+        low, high = parity['oat'][name]
+        lo_range, hi_range = compute_parity.RANGES[name]
+        for value, bound, color, later in [(low, lo_range, '#2196F3', low > high),
+                                           (high, hi_range, '#F44336', high >= low)]:
+            ax1.barh(i, value - central, left=central, color=color, edgecolor='black', alpha=0.8)
+            ax1.text(max(value, central) + 0.05 if later else min(value, central) - 0.05, i, f'{bound:g}',
+                     va='center', ha='left' if later else 'right', fontsize=9)
+    ax1.axvline(central, color='black', linewidth=2)
+    ax1.margins(x=0.12)
+    ax1.set_yticks(range(len(order)))
+    ax1.set_yticklabels(labels, fontsize=10)
+    ax1.set_xlabel('Compute Parity Year', fontsize=12)
+    ax1.set_title(f'Tornado: Parity Year Swing per Input\n(central estimate {central:.1f})',
+                  fontsize=12, fontweight='bold')
+    ax1.legend(handles=[mpatches.Patch(color='#2196F3', label='Input at low end'),
+                        mpatches.Patch(color='#F44336', label='Input at high end')],
+               loc='lower right', fontsize=9)
+    ax1.grid(True, axis='x', alpha=0.3)
+
+    # RIGHT: Sobol indices, same order
+    first = [parity['sobol'][name][0] for name in order]
+    total = [parity['sobol'][name][1] for name in order]
+    y = np.arange(len(order))
+    ax2.barh(y - 0.2, total, height=0.4, color='#FF9800', edgecolor='black', label='Total effect (ST)')
+    ax2.barh(y + 0.2, first, height=0.4, color='#4CAF50', edgecolor='black', label='First order (S1)')
+    ax2.set_yticks(y)
+    ax2.set_yticklabels([])
+    ax2.set_xlim(0, 1)
+    ax2.set_xlabel('Share of Parity-Year Variance', fontsize=12)
+    ax2.set_title(f"Sobol Indices ({parity['evaluations']:,} evaluations)\n"
+                  f"90% range: {parity['p5']:.1f}-{parity['p95']:.1f}", fontsize=12, fontweight='bold')
+    ax2.legend(loc='lower right', fontsize=9)
+    ax2.grid(True, axis='x', alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+# Fourth figure: Uncertainty of the compute race
+def plot_compute_fan():
+    fig, ax = plt.subplots(figsize=(14, 8))
+    result = ensemble.baseline('compute')
+    years = ensemble.COMPUTE_YEARS
+    fan(ax, years, result['bands']['us'], 'blue', 'US/West (power-constrained)')
+    fan(ax, years, result['bands']['china'], 'red', 'China (power-expanding)')
+
+    parity = compute_parity.baseline()
+    ax.axvspan(parity['p5'], parity['p95'], color='gray', alpha=0.1)
+    ax.axvline(x=parity['central'], color='gray', linestyle='--', linewidth=2, alpha=0.7)
+    ax.text(parity['central'] + 0.1, 0.97, f"Compute\nParity\n(~{parity['central']:.0f})", fontsize=9,
+            ha='left', va='top', transform=ax.get_xaxis_transform())
+
+    ax.set_xlabel('Year', fontsize=12)
+    ax.set_ylabel('Effective AI Compute Capacity (Index)', fontsize=12)
+    ax.set_title(f"Projected AI Compute Race with Uncertainty\n"
+                 f"({result['n_members']:,} draws over the sensitivity ranges; bands: 50% and 90%, line: median)",
+                 fontsize=14, fontweight='bold')
+    ax.legend(loc='upper left', fontsize=10)
+    ax.set_xlim(2025.5, 2033.5)
+    ax.set_ylim(bottom=0)
+    ax.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+FIGURES = {
+    'power_bottleneck.png': plot_power_bottleneck,
+    'china_vs_us_comparison.png': plot_china_vs_us_comparison,
+    'parity_tornado.png': plot_parity_tornado,
+    'compute_fan.png': plot_compute_fan,
+}
+
+
+def main():
+    for filename, plot in FIGURES.items():
+        write_chart(filename, plot)
+    print("\nAll power analysis charts generated successfully!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Cached building blocks for the reportlab story
+Paragraph styles and table styles are built once per process; paragraphs and
+tables are memoized by a hash of their content and remember their layout for
+each available width, so rebuilding the PDF after editing one section only
+creates and lays out the flowables that actually changed
+Images are resampled to the resolution they are placed at and reduced to a
+palette once per source PNG (cached on disk by its hash); a chart placed
+twice is one image in the PDF
+"""
+import copy
+import functools
+import hashlib
+import io
+import math
+from collections import OrderedDict
+
+from PIL import Image as PILImage
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import Image, Paragraph, Spacer, Table, TableStyle
+
+import render_cache
+
+MAX_FLOWABLES = 4096
+
+# Charts are rendered at 150 dpi for figures much wider than the page, so at
+# their placed size they are always downsampled to this resolution
+IMAGE_DPI = 150
+IMAGE_COLORS = 256
+
+# Write image streams as binary: ASCII85 makes them 25% larger and, without
+# reportlab's C accelerator, takes longer than the rest of the build
+rl_config.useA85 = 0
+
+# Header row and grid shared by every table in the report
+TABLE_BASE = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+]
+BODY = (('beige', 1, -1),)
+
+_flowables = OrderedDict()
+stats = {'hits': 0, 'misses': 0}
+
+
+@functools.lru_cache(maxsize=None)
+def stylesheet():
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(name='H1', fontSize=18, spaceAfter=12, spaceBefore=6, textColor=colors.darkblue, fontName='Helvetica-Bold'))
+    styles.add(ParagraphStyle(name='H2', fontSize=14, spaceAfter=10, spaceBefore=12, textColor=colors.darkblue, fontName='Helvetica-Bold'))
+    styles.add(ParagraphStyle(name='H3', fontSize=12, spaceAfter=8, spaceBefore=10, fontName='Helvetica-Bold'))
+    styles.add(ParagraphStyle(name='H4', fontSize=11, spaceAfter=6, spaceBefore=8, fontName='Helvetica-Bold'))
+    styles.add(ParagraphStyle(name='Body', fontSize=10, spaceAfter=6, leading=14))
+    styles.add(ParagraphStyle(name='MyBullet', fontSize=10, spaceAfter=4, leftIndent=20, bulletIndent=10, leading=14))
+    styles.add(ParagraphStyle(name='MyBullet2', fontSize=10, spaceAfter=2, leftIndent=40, bulletIndent=30, leading=14))
+    styles.add(ParagraphStyle(name='TableCell', fontSize=9, leading=11))
+    styles.add(ParagraphStyle(name='TableHeader', fontSize=9, leading=11, textColor=colors.whitesmoke, fontName='Helvetica-Bold'))
+    return styles
+
+
+@functools.lru_cache(maxsize=None)
+def table_style(align='LEFT', font_size=9, highlights=BODY):
+    """
+    Shared TableStyle; highlights are (colour name, first row, last row)
+    backgrounds applied in order after the header
+    """
+    commands = TABLE_BASE + [
+        ('ALIGN', (0, 0), (-1, -1), align),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+    ]
+    commands += [('BACKGROUND', (0, first), (-1, last), getattr(colors, name)) for name, first, last in highlights]
+    commands.append(('GRID', (0, 0), (-1, -1), 0.5, colors.grey))
+    return TableStyle(commands)
+
+
+class _LayoutCache:
+    """
+    Remembers the wrapped state for each available width. Neither our
+    paragraphs nor our tables (no fixed row heights) depend on the available
+    height, so a flowable laid out once at a width is never laid out again
+    """
+    # Per-build bookkeeping reportlab attaches to flowables; never shared
+    _TRANSIENT = {'_layouts', '_postponed', '_frame'}
+
+    def wrap(self, availWidth, availHeight):
+        # Pieces created by splitting across frames start without layouts
+        layouts = self.__dict__.setdefault('_layouts', {})
+        if availWidth in layouts:
+            size, state = layouts[availWidth]
+            self.__dict__.update(state)
+            return size
+        size = super().wrap(availWidth, availHeight)
+        layouts[availWidth] = (size, {k: v for k, v in self.__dict__.items() if k not in self._TRANSIENT})
+        return size
+
+
+class _Paragraph(_LayoutCache, Paragraph):
+    pass
+
+
+class _Table(_LayoutCache, Table):
+    pass
+
+
+def _memo(key, create):
+    """
+    Return a flowable for the content key. The cached instance is handed out
+    as a shallow copy: copies share its layouts, while the state reportlab
+    attaches during a build stays with each placement
+    """
+    key = hashlib.sha256(repr(key).encode()).hexdigest()
+    flowable = _flowables.get(key)
+    if flowable is None:
+        stats['misses'] += 1
+        flowable = _flowables[key] = create()
+        flowable._layouts = {}
+        while len(_flowables) > MAX_FLOWABLES:
+            _flowables.popitem(last=False)
+    else:
+        stats['hits'] += 1
+        _flowables.move_to_end(key)
+    return copy.copy(flowable)
+
+
+def paragraph(text, style='Body'):
+    return _memo(('paragraph', text, style), lambda: _Paragraph(text, stylesheet()[style]))
+
+
+def spacer(height, width=1):
+    return _memo(('spacer', width, height), lambda: Spacer(width, height))
+
+
+def _encoded_image(data, digest, pixels):
+    """PNG bytes for `data` resampled to `pixels` wide with an IMAGE_COLORS palette (disk-cached)."""
+    key = hashlib.sha256(f'pdf-image\0{digest}\0{pixels}\0{IMAGE_DPI}\0{IMAGE_COLORS}'.encode()).hexdigest()
+    encoded = render_cache.lookup(key)
+    if encoded is None:
+        source = PILImage.open(io.BytesIO(data)).convert('RGB')
+        height = max(1, round(pixels * source.height / source.width))
+        resampled = source.resize((pixels, height), PILImage.Resampling.LANCZOS).quantize(IMAGE_COLORS)
+        buf = io.BytesIO()
+        resampled.save(buf, format='PNG')
+        encoded = buf.getvalue()
+        render_cache.store(key, encoded)
+    return encoded
+
+
+def image(data, width, max_height):
+    """
+    Image flowable for PNG bytes, `width` points wide (less if that would
+    exceed max_height), resampled to IMAGE_DPI at that size
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    size = PILImage.open(io.BytesIO(data)).size
+    width = min(width, max_height * size[0] / size[1])
+    height = width * size[1] / size[0]
+    pixels = min(size[0], math.ceil(width / inch * IMAGE_DPI))
+    return _memo(('image', digest, width, height, pixels),
+                 lambda: Image(io.BytesIO(_encoded_image(data, digest, pixels)), width, height))
+
+
+def table(rows, col_widths, align='LEFT', font_size=9, highlights=BODY, wrap=False):
+    """
+    Table from plain row data using a shared style; with wrap=True cells are
+    paragraphs (inline markup, text wrapped to the column width)
+    """
+    rows = tuple(tuple(row) for row in rows)
+    col_widths = tuple(col_widths)
+    highlights = tuple(highlights)
+
+    def create():
+        cells = [list(row) for row in rows]
+        if wrap:
+            cells = [[paragraph(cell, 'TableHeader' if i == 0 else 'TableCell') for cell in row]
+                     for i, row in enumerate(cells)]
+        return _Table(cells, colWidths=list(col_widths), style=table_style(align, font_size, highlights))
+
+    return _memo(('table', rows, col_widths, align, font_size, highlights, wrap), create)
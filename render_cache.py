@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache of rendered chart bytes
+Keys hash the plot function's source, the data and helpers it uses, the
+save settings and the library versions, so editing one number in one chart
+only invalidates that chart. A module that reads input files lists them in
+a module-level DATA_FILES (paths relative to the module), and their
+contents are part of the key of every chart that uses the module
+"""
+import hashlib
+import inspect
+import os
+import sys
+import tempfile
+import types
+
+import matplotlib
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+# Chart scripts live in REPO_DIR, the models in its forecast package
+LOCAL_DIRS = {REPO_DIR, os.path.join(REPO_DIR, 'forecast')}
+CACHE_DIR = os.environ.get('LLM_FORECAST_CACHE', os.path.join(REPO_DIR, '.render_cache'))
+MAX_BYTES = 256 * 1024 * 1024
+
+LIBRARY_VERSIONS = (sys.version_info[:2], matplotlib.__version__, np.__version__)
+
+# (path, mtime, size) -> digest of a data file, so unchanged files are read once
+_file_digests = {}
+
+
+def _is_local(obj):
+    """True for functions and modules defined in this repository."""
+    try:
+        return os.path.dirname(os.path.abspath(inspect.getfile(obj))) in LOCAL_DIRS
+    except TypeError:
+        return False
+
+
+def _code_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _is_data(value):
+    """True for numbers, strings, arrays and containers of them: values whose repr is stable."""
+    if isinstance(value, (tuple, list)):
+        return all(_is_data(v) for v in value)
+    if isinstance(value, dict):
+        return all(_is_data(k) and _is_data(v) for k, v in value.items())
+    return value is None or isinstance(value, (int, float, str, bytes, np.ndarray, np.generic))
+
+
+def _hash_value(h, value):
+    if isinstance(value, np.ndarray):
+        h.update(f'{value.dtype}{value.shape}'.encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    else:
+        h.update(repr(value).encode())
+
+
+def _file_digest(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return 'missing'
+    signature = (path, st.st_mtime_ns, st.st_size)
+    if signature not in _file_digests:
+        with open(path, 'rb') as f:
+            _file_digests[signature] = hashlib.sha256(f.read()).hexdigest()
+    return _file_digests[signature]
+
+
+def _hash_data_files(h, module, seen):
+    """Hash the contents of the files a module declares in DATA_FILES."""
+    if module is None or ('data', module) in seen:
+        return
+    seen.add(('data', module))
+    directory = os.path.dirname(os.path.abspath(module.__file__))
+    for name in getattr(module, 'DATA_FILES', ()):
+        h.update(f'{name}\0{_file_digest(os.path.join(directory, name))}'.encode())
+
+
+def _hash_function(h, func, seen):
+    """
+    Hash a function's source plus every local helper and constant it
+    references, and its default argument values (a default such as
+    bins=DENSITY_BINS names a constant that the body never references)
+    """
+    if func in seen:
+        return
+    seen.add(func)
+    h.update(inspect.getsource(func).encode())
+    _hash_data_files(h, inspect.getmodule(func), seen)
+    for value in list(func.__defaults__ or ()) + sorted((func.__kwdefaults__ or {}).items()):
+        if _is_data(value):
+            _hash_value(h, value)
+    for name in sorted(_code_names(func.__code__)):
+        if name not in func.__globals__:
+            continue
+        value = inspect.unwrap(func.__globals__[name])
+        if isinstance(value, types.FunctionType):
+            if _is_local(value):
+                _hash_function(h, value, seen)
+        elif isinstance(value, types.ModuleType):
+            if _is_local(value):
+                _hash_module(h, value, seen)
+        elif _is_data(value):
+            h.update(name.encode())
+            _hash_value(h, value)
+
+
+def _hash_module(h, module, seen):
+    """
+    Hash a local module's source plus, recursively, the local modules it
+    imports and the modules of the local functions it imports by name. Its
+    numeric and container globals are hashed by value, which covers the
+    constants it imports from other modules (`from x import SPREAD`)
+    """
+    if module in seen:
+        return
+    seen.add(module)
+    h.update(inspect.getsource(module).encode())
+    _hash_data_files(h, module, seen)
+    for name, value in sorted(vars(module).items()):
+        if name.startswith('__'):
+            continue
+        value = inspect.unwrap(value)
+        if isinstance(value, types.ModuleType):
+            if _is_local(value):
+                _hash_module(h, value, seen)
+        elif isinstance(value, (types.FunctionType, type)):
+            owner = inspect.getmodule(value)
+            if owner is not None and owner is not module and _is_local(owner):
+                _hash_module(h, owner, seen)
+        elif not isinstance(value, (str, bytes)) and _is_data(value):
+            h.update(name.encode())
+            _hash_value(h, value)
+
+
+def figure_key(plot, savefig_kwargs, params=None):
+    """Return the cache key for rendering plot(**params) with the given save settings."""
+    h = hashlib.sha256()
+    _hash_function(h, plot, set())
+    for name, value in sorted((params or {}).items()):
+        h.update(name.encode())
+        _hash_value(h, value)
+    h.update(repr(sorted(savefig_kwargs.items())).encode())
+    h.update(repr(LIBRARY_VERSIONS).encode())
+    return h.hexdigest()
+
+
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir, key)
+
+
+def lookup(key, cache_dir=CACHE_DIR):
+    """Return the cached bytes for key, or None. A hit marks the entry as recently used."""
+    path = _entry_path(key, cache_dir)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    os.utime(path)
+    return data
+
+
+def store(key, data, cache_dir=CACHE_DIR, max_bytes=MAX_BYTES):
+    """Add an entry, then evict least recently used entries beyond max_bytes."""
+    os.makedirs(cache_dir, exist_ok=True)
+    # Parallel builds may store the same key; write-then-rename keeps entries whole
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix='.tmp-')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, _entry_path(key, cache_dir))
+    evict(cache_dir, max_bytes)
+
+
+def evict(cache_dir=CACHE_DIR, max_bytes=MAX_BYTES):
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and not entry.name.startswith('.tmp-'):
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Long-lived render worker on a Unix socket
+The server imports matplotlib, numpy and reportlab, warms the font cache and
+the model baselines once, then forks workers that share the listening
+socket. Each job names build targets (charts, the PDF, the HTML); figures
+are closed after every job and a worker exits after --max-jobs jobs, to be
+replaced by a fresh fork of the warm server, so memory stays bounded and a
+job never pays interpreter start-up
+The client side (render(), `render_worker.py render`) only uses the
+standard library, so asking for a chart costs a connect and the render itself
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+SOCKET_PATH = os.environ.get('LLM_FORECAST_SOCKET',
+                             os.path.join(tempfile.gettempdir(), f'llm_forecast-{os.getuid()}.sock'))
+MAX_JOBS = 100
+BACKLOG = 64
+
+
+# ============================================
+# Server
+# ============================================
+def warm():
+    """Import and exercise everything a job can touch, before any worker is forked."""
+    # Imported here so the client never pays for matplotlib or reportlab
+    import matplotlib.pyplot as plt
+
+    import build
+    from figures import render_png
+    from forecast import agi_monte_carlo, compute_parity, data_exhaustion
+
+    fig = plt.figure(figsize=(2, 1))
+    fig.text(0.5, 0.5, 'warm', fontweight='bold', ha='center')
+    render_png(fig)
+    agi_monte_carlo.baseline()
+    compute_parity.baseline()
+    data_exhaustion.baseline()
+    return build
+
+
+def run_job(build, request):
+    """Build the requested targets (and their dependencies) in this process; returns the reply."""
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    try:
+        timings = {}
+        for name in build.resolve(request['targets']):
+            timings[name] = build.run_target(name, request.get('use_cache', True),
+                                             tuple(request.get('formats', build.DEFAULT_FORMATS)))
+        return {'ok': True, 'timings': timings, 'seconds': time.perf_counter() - start}
+    except Exception as e:
+        return {'ok': False, 'error': f'{type(e).__name__}: {e}', 'seconds': time.perf_counter() - start}
+    finally:
+        # A failed plot leaves its figure open; never carry figures between jobs
+        plt.close('all')
+        sys.stdout.flush()
+
+
+def _worker(server, build, max_jobs):
+    """Forked worker: serve up to max_jobs jobs from the shared socket, then exit."""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    for _ in range(max_jobs):
+        conn, _ = server.accept()
+        with conn, conn.makefile('rwb') as stream:
+            line = stream.readline()
+            if not line:
+                continue
+            try:
+                reply = run_job(build, json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                reply = {'ok': False, 'error': f'bad request: {e}'}
+            try:
+                stream.write(json.dumps(reply).encode() + b'\n')
+                stream.flush()
+            except OSError:
+                pass  # client went away
+
+
+def _claim_socket(socket_path):
+    """Remove a stale socket file; refuse to start if a server is already listening."""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+    else:
+        raise RuntimeError(f'a render worker is already listening on {socket_path}')
+    finally:
+        probe.close()
+
+
+def serve(socket_path=SOCKET_PATH, max_jobs=MAX_JOBS, workers=1):
+    """Warm up, then keep `workers` forked workers accepting jobs until interrupted."""
+    start = time.perf_counter()
+    build = warm()
+    _claim_socket(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(BACKLOG)
+    print(f"Render worker warm in {time.perf_counter() - start:.2f}s, listening on {socket_path} "
+          f"({workers} worker{'s' if workers > 1 else ''}, recycled every {max_jobs} jobs)", flush=True)
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    children = set()
+    try:
+        while True:
+            while len(children) < workers:
+                pid = os.fork()
+                if pid == 0:
+                    try:
+                        _worker(server, build, max_jobs)
+                    finally:
+                        sys.stdout.flush()
+                        os._exit(0)
+                children.add(pid)
+            pid, _ = os.wait()
+            children.discard(pid)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+# ============================================
+# Client
+# ============================================
+def render(targets, use_cache=True, socket_path=SOCKET_PATH, formats=('png',)):
+    """
+    Ask the running worker to build targets; returns its reply
+    ({'ok', 'timings' or 'error', 'seconds'}). Raises OSError if no worker is listening
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path)
+        with conn.makefile('rwb') as stream:
+            request = {'targets': list(targets), 'use_cache': use_cache, 'formats': list(formats)}
+            stream.write(json.dumps(request).encode() + b'\n')
+            stream.flush()
+            line = stream.readline()
+    if not line:
+        raise ConnectionError('render worker closed the connection without replying')
+    return json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Warm render worker for the charts and the report')
+    parser.add_argument('--socket', default=SOCKET_PATH, help=f'Unix socket path (default: {SOCKET_PATH})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='run the worker')
+    serve_parser.add_argument('--max-jobs', type=int, default=MAX_JOBS,
+                              help='jobs per worker before it is replaced by a fresh fork')
+    serve_parser.add_argument('-j', '--workers', type=int, default=1, help='worker processes')
+
+    render_parser = commands.add_parser('render', help='build targets through the running worker')
+    render_parser.add_argument('targets', nargs='+')
+    render_parser.add_argument('--no-cache', action='store_true', help='re-render, ignoring the render cache')
+    render_parser.add_argument('--formats', default='png', help='comma-separated chart formats (see build.py)')
+    render_parser.add_argument('--no-fallback', action='store_true',
+                               help='fail instead of building in-process when no worker is running')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.socket, args.max_jobs, args.workers)
+        return 0
+
+    start = time.perf_counter()
+    try:
+        reply = render(args.targets, not args.no_cache, args.socket, tuple(args.formats.split(',')))
+    except OSError:
+        if args.no_fallback:
+            print(f"No render worker listening on {args.socket}", file=sys.stderr)
+            return 1
+        print("No render worker running; building in-process", file=sys.stderr)
+        import build
+        build.build(args.targets, jobs=1, use_cache=not args.no_cache, formats=tuple(args.formats.split(',')))
+        return 0
+
+    if not reply['ok']:
+        print(f"Render failed: {reply['error']}", file=sys.stderr)
+        return 1
+    for name, seconds in reply['timings'].items():
+        print(f"  built {name:<32} {seconds:6.2f}s")
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Compile the markdown report into a document tree, then into a reportlab story
+and an HTML fragment
+The tree is split at level-2 headings; each section is compiled once per
+distinct source (after expanding {{field}} placeholders) and reused until its
+hash changes, so editing one section only recompiles that section
+Images referenced by a section are part of its hash, so a re-rendered chart
+recompiles the section that shows it
+"""
+import hashlib
+import html
+import re
+from collections import OrderedDict
+
+from reportlab.lib.units import inch
+
+import pdf_builder
+
+FIELD = re.compile(r'\{\{\s*([\w]+)((?::[^}:]+)*)\s*\}\}')
+HEADING = re.compile(r'^(#{1,6})\s+(.*)$')
+IMAGE = re.compile(r'^!\[([^\]]*)\]\(([^)]+)\)$')
+LIST_ITEM = re.compile(r'^(\s*)([-*]|\d+\.)\s+(.*)$')
+RULE = re.compile(r'^(-{3,}|\*{3,})$')
+
+# Width available to tables and images on the page (letter, 0.75 inch margins)
+TEXT_WIDTH = 7.0 * inch
+MAX_IMAGE_HEIGHT = 7.5 * inch
+MIN_COLUMN_SHARE = 0.12
+
+# Compiled sections kept for reuse; old versions of edited sections age out
+MAX_SECTIONS = 256
+
+_sections = OrderedDict()
+stats = {'compiled': 0, 'reused': 0}
+
+
+# ============================================
+# Parsing: markdown -> tree
+# ============================================
+def expand_fields(text, fields):
+    """Replace {{name}} / {{name:arg:...}} with fields[name](*args); fields are only evaluated if used."""
+    def replace(match):
+        name, args = match.group(1), match.group(2)
+        if name not in fields:
+            raise KeyError(f'unknown report field {{{{{name}}}}}')
+        return str(fields[name](*[a for a in args.split(':') if a]))
+    return FIELD.sub(replace, text)
+
+
+def split_sections(text):
+    """Split source text at level-2 headings; the preamble (title) is section 0."""
+    sections = [[]]
+    for line in text.splitlines():
+        if line.startswith('## '):
+            sections.append([])
+        sections[-1].append(line)
+    return ['\n'.join(lines).strip('\n') + '\n' for lines in sections if any(l.strip() for l in lines)]
+
+
+def _table_row(line):
+    return [cell.strip() for cell in line.strip().strip('|').split('|')]
+
+
+def _parse_list(lines, i):
+    """Parse a (possibly nested) list starting at lines[i]; returns (block, next index)."""
+    indent, marker, _ = LIST_ITEM.match(lines[i]).groups()
+    block = {'type': 'list', 'ordered': marker[0].isdigit(), 'items': []}
+    while i < len(lines):
+        match = LIST_ITEM.match(lines[i])
+        if not match or len(match.group(1)) < len(indent):
+            break
+        if len(match.group(1)) > len(indent):
+            child, i = _parse_list(lines, i)
+            block['items'][-1]['children'].append(child)
+            continue
+        block['items'].append({'text': match.group(3), 'children': []})
+        i += 1
+    return block, i
+
+
+def parse(text):
+    """Parse one section of markdown into a list of block dicts."""
+    lines = text.splitlines()
+    blocks = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if not stripped:
+            i += 1
+        elif RULE.match(stripped):
+            blocks.append({'type': 'rule'})
+            i += 1
+        elif HEADING.match(stripped):
+            hashes, title = HEADING.match(stripped).groups()
+            blocks.append({'type': 'heading', 'level': len(hashes), 'text': title})
+            i += 1
+        elif IMAGE.match(stripped):
+            alt, src = IMAGE.match(stripped).groups()
+            blocks.append({'type': 'image', 'alt': alt, 'src': src})
+            i += 1
+        elif stripped.startswith('|'):
+            rows = []
+            while i < len(lines) and lines[i].strip().startswith('|'):
+                rows.append(_table_row(lines[i]))
+                i += 1
+            # rows[1] is the |---|---| separator
+            blocks.append({'type': 'table', 'header': rows[0], 'rows': rows[2:]})
+        elif LIST_ITEM.match(line):
+            block, i = _parse_list(lines, i)
+            blocks.append(block)
+        else:
+            text_lines = []
+            while i < len(lines) and lines[i].strip() and not (
+                    LIST_ITEM.match(lines[i]) or HEADING.match(lines[i].strip())
+                    or lines[i].strip().startswith('|') or IMAGE.match(lines[i].strip())):
+                text_lines.append(lines[i].strip())
+                i += 1
+            blocks.append({'type': 'paragraph', 'text': ' '.join(text_lines)})
+    return blocks
+
+
+# ============================================
+# Output: tree -> reportlab story / HTML
+# ============================================
+def _inline(text, bold, italic):
+    text = html.escape(text, quote=False)
+    text = re.sub(r'\*\*(.+?)\*\*', rf'<{bold}>\1</{bold}>', text)
+    return re.sub(r'(?<![*\w])\*(?!\s)(.+?)(?<!\s)\*(?![*\w])', rf'<{italic}>\1</{italic}>', text)
+
+
+def _pdf_inline(text):
+    return _inline(text, 'b', 'i')
+
+
+def _html_inline(text):
+    return _inline(text, 'strong', 'em')
+
+
+def _plain(text):
+    return re.sub(r'\*+', '', text)
+
+
+def slug(text):
+    """Pandoc-style identifier: leading non-letters dropped, lowercased, spaces to hyphens."""
+    text = re.sub(r'^[^A-Za-z]+', '', _plain(text)).lower()
+    text = re.sub(r'[^\w\s.-]', '', text)
+    return re.sub(r'\s+', '-', text.strip())
+
+
+def _column_widths(header, rows):
+    longest = [max(len(_plain(row[j])) if j < len(row) else 0 for row in [header] + rows) for j in range(len(header))]
+    shares = [max(n / sum(longest), MIN_COLUMN_SHARE) for n in longest]
+    return [TEXT_WIDTH * share / sum(shares) for share in shares]
+
+
+def _list_story(block, depth=0):
+    story = []
+    style = 'MyBullet' if depth == 0 else 'MyBullet2'
+    for n, item in enumerate(block['items'], 1):
+        marker = f'{n}.' if block['ordered'] else '•'
+        story.append(pdf_builder.paragraph(f"{marker} {_pdf_inline(item['text'])}", style))
+        for child in item['children']:
+            story += _list_story(child, depth + 1)
+    return story
+
+
+def to_story(blocks, images=None):
+    """reportlab flowables for a list of blocks; images maps src -> PNG bytes (others are skipped)."""
+    images = images or {}
+    story = []
+    for block in blocks:
+        kind = block['type']
+        if kind == 'heading':
+            story.append(pdf_builder.paragraph(_pdf_inline(block['text']), f"H{min(block['level'], 4)}"))
+        elif kind == 'paragraph':
+            story.append(pdf_builder.paragraph(_pdf_inline(block['text']), 'Body'))
+        elif kind == 'list':
+            story += _list_story(block)
+            story.append(pdf_builder.spacer(6))
+        elif kind == 'table':
+            rows = [[_pdf_inline(cell) for cell in block['header']]]
+            rows += [[_pdf_inline(cell) for cell in row] for row in block['rows']]
+            story.append(pdf_builder.table(rows, _column_widths(block['header'], block['rows']), wrap=True))
+            story.append(pdf_builder.spacer(6))
+        elif kind == 'image' and block['src'] in images:
+            story.append(pdf_builder.image(images[block['src']], TEXT_WIDTH, MAX_IMAGE_HEIGHT))
+            story.append(pdf_builder.spacer(6))
+        elif kind == 'rule':
+            story.append(pdf_builder.spacer(12))
+    return story
+
+
+def _list_html(block):
+    out = ['<ol type="1">' if block['ordered'] else '<ul>']
+    for item in block['items']:
+        children = ''.join('\n' + _list_html(child) for child in item['children'])
+        out.append(f"<li>{_html_inline(item['text'])}{children}</li>")
+    out.append('</ol>' if block['ordered'] else '</ul>')
+    return '\n'.join(out)
+
+
+def to_html(blocks, id_prefix=''):
+    """HTML fragment for a list of blocks, in the layout pandoc produces."""
+    out = []
+    seen = {}
+    for block in blocks:
+        kind = block['type']
+        if kind == 'heading':
+            ident = slug(block['text'])
+            if block['level'] > 2:
+                ident = id_prefix + ident
+            seen[ident] = seen.get(ident, -1) + 1
+            if seen[ident]:
+                ident = f'{ident}-{seen[ident]}'
+            level = block['level']
+            out.append(f'<h{level} id="{ident}">{_html_inline(block["text"])}</h{level}>')
+        elif kind == 'paragraph':
+            out.append(f"<p>{_html_inline(block['text'])}</p>")
+        elif kind == 'list':
+            out.append(_list_html(block))
+        elif kind == 'table':
+            rows = ['<table>', '<thead>', '<tr class="header">']
+            rows += [f'<th>{_html_inline(cell)}</th>' for cell in block['header']]
+            rows += ['</tr>', '</thead>', '<tbody>']
+            for n, row in enumerate(block['rows']):
+                rows.append(f'<tr class="{"odd" if n % 2 == 0 else "even"}">')
+                rows += [f'<td>{_html_inline(cell)}</td>' for cell in row]
+                rows.append('</tr>')
+            rows += ['</tbody>', '</table>']
+            out.append('\n'.join(rows))
+        elif kind == 'image':
+            alt = html.escape(block['alt'])
+            out.append(f'<figure>\n<img src="{html.escape(block["src"])}" alt="{alt}" />\n'
+                       f'<figcaption aria-hidden="true">{alt}</figcaption>\n</figure>')
+        elif kind == 'rule':
+            out.append('<hr />')
+    return '\n'.join(out) + '\n'
+
+
+# ============================================
+# Incremental compilation
+# ============================================
+def _read_images(source, image_data):
+    images = {}
+    for line in source.splitlines():
+        match = IMAGE.match(line.strip())
+        if match and match.group(2) not in images:
+            images[match.group(2)] = image_data(match.group(2))
+    return images
+
+
+def compile_section(source, index=0, image_data=None):
+    """
+    Compile one section's (field-expanded) source; returns a dict with
+    index, title, hash, blocks, story and html. Results are cached by hash
+    image_data maps an image src to the PNG bytes to embed in the PDF;
+    without it images only appear in the HTML
+    """
+    images = _read_images(source, image_data) if image_data else {}
+    h = hashlib.sha256(f'{index}\0{source}'.encode())
+    for src, data in images.items():
+        h.update(f'\0{src}\0{hashlib.sha256(data).hexdigest()}'.encode())
+    key = h.hexdigest()
+    section = _sections.get(key)
+    if section is not None:
+        stats['reused'] += 1
+        _sections.move_to_end(key)
+        return section
+    stats['compiled'] += 1
+    blocks = parse(source)
+    headings = [b for b in blocks if b['type'] == 'heading']
+    section = {
+        'index': index,
+        'title': headings[0]['text'] if headings else '',
+        'hash': key,
+        'blocks': blocks,
+        'story': to_story(blocks, images),
+        'html': to_html(blocks, id_prefix=f's{index}-' if index else ''),
+    }
+    _sections[key] = section
+    while len(_sections) > MAX_SECTIONS:
+        _sections.popitem(last=False)
+    return section
+
+
+def compile_report(text, fields=None, sections=None, image_data=None):
+    """
+    Compile the report; `sections` limits the output to those section
+    indices (0 is the title block). Fields are expanded per section, so a
+    section that uses none never evaluates any
+    """
+    compiled = []
+    for index, source in enumerate(split_sections(text)):
+        if sections is not None and index not in sections:
+            continue
+        compiled.append(compile_section(expand_fields(source, fields or {}), index, image_data))
+    return compiled
+
+
+def image_sources(text):
+    """Every image src referenced by the report, in order of first use."""
+    return list(dict.fromkeys(m.group(2) for m in map(IMAGE.match, map(str.strip, text.splitlines())) if m))
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Watch the chart scripts, the report source and data files, and rebuild only
+what each save affects
+A changed module is reloaded along with every local module that imports it.
+A data file counts as a change to the modules that name it, and the charts
+built on them are always redrawn. Otherwise a chart is redrawn only if its
+render cache key changed: the key hashes the plot function, the helpers,
+constants and defaults it uses and, recursively, the local modules it calls
+into. So editing one figure in generate_data_wall.py leaves the other one
+alone, while editing a forecast model redraws every chart built on it. The report is recompiled and its section hashes compared,
+and the PDF and HTML are rebuilt only if a section changed; superseded
+sections age out of report_compiler's bounded cache, so a long session does
+not accumulate every version of an edited section
+Bursts of saves are debounced into one rebuild. Everything runs in this
+process, warmed up like render_worker.py, so a rebuild never pays for
+imports or for model baselines the change did not touch
+"""
+import argparse
+import ast
+import glob
+import importlib
+import os
+import sys
+import time
+import traceback
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+# Chart scripts live in REPO_DIR, the models in its forecast package
+LOCAL_DIRS = [REPO_DIR, os.path.join(REPO_DIR, 'forecast')]
+
+# Seconds between scans, and of quiet after a change before rebuilding
+POLL = 0.05
+DEBOUNCE = 0.1
+
+# Data files are watched next to the scripts
+DATA_PATTERNS = ('*.csv', '*.json', '*.npy', '*.npz')
+
+# Module path -> (file signature, names it imports), so a rebuild only parses what changed
+_import_names = {}
+
+
+# ============================================
+# Changes
+# ============================================
+def watched_files():
+    """{path: (mtime, size, inode)} for the scripts, the report source and data files."""
+    import generate_pdf
+
+    paths = [generate_pdf.REPORT_SOURCE]
+    for directory in LOCAL_DIRS:
+        paths += glob.glob(os.path.join(directory, '*.py'))
+    for pattern in DATA_PATTERNS:
+        paths += glob.glob(os.path.join(REPO_DIR, pattern))
+    files = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        files[path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+    return files
+
+
+def wait_for_changes(files, poll=POLL, debounce=DEBOUNCE):
+    """
+    Block until a watched file changes and no further change follows within
+    `debounce` seconds; returns (the new watched_files(), changed paths)
+    """
+    current = files
+    while current == files:
+        time.sleep(poll)
+        current = watched_files()
+    while True:
+        time.sleep(debounce)
+        latest = watched_files()
+        if latest == current:
+            break
+        current = latest
+    return current, {path for path in files.keys() | current.keys() if files.get(path) != current.get(path)}
+
+
+# ============================================
+# Reloading
+# ============================================
+def local_modules():
+    """{name: module} for every loaded module of this repository except this one."""
+    # This script may also be loaded as __main__ and multiprocessing's __mp_main__ alias
+    this = {sys.modules['__main__'], sys.modules[__name__]}
+    modules = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if path and module not in this and os.path.dirname(os.path.abspath(path)) in LOCAL_DIRS:
+            modules[name] = module
+    return modules
+
+
+def _imports(module):
+    """Dotted names a module imports, anywhere in its source ('forecast.scenarios' for `from forecast import scenarios`)."""
+    path = module.__file__
+    try:
+        st = os.stat(path)
+        signature = (st.st_mtime_ns, st.st_size)
+        if path in _import_names and _import_names[path][0] == signature:
+            return _import_names[path][1]
+        with open(path) as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError):
+        return set()
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names |= {alias.name for alias in node.names}
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names |= {f'{node.module}.{alias.name}' for alias in node.names}
+    _import_names[path] = (signature, names)
+    return names
+
+
+def _dependencies(module, modules):
+    """The loaded local modules a module imports: for each name, its longest prefix that is one."""
+    found = set()
+    for name in _imports(module):
+        parts = name.split('.')
+        for i in range(len(parts), 0, -1):
+            if '.'.join(parts[:i]) in modules:
+                found.add('.'.join(parts[:i]))
+                break
+    return found
+
+
+def changed_modules(paths):
+    """Names of the loaded local modules behind changed files; a data file maps to the modules naming it."""
+    modules = local_modules()
+    by_path = {os.path.abspath(module.__file__): name for name, module in modules.items()}
+    names = {by_path[path] for path in paths if path in by_path}
+    data = [os.path.basename(path) for path in paths if not path.endswith(('.py', '.md'))]
+    if data:
+        for name, module in modules.items():
+            with open(module.__file__) as f:
+                source = f.read()
+            if any(filename in source for filename in data):
+                names.add(name)
+    return names
+
+
+def reload_order(names):
+    """`names` plus every local module importing them (directly or not), each after its dependencies."""
+    modules = local_modules()
+    imports = {name: _dependencies(module, modules) for name, module in modules.items()}
+    stale = set(names) & modules.keys()
+    while True:
+        dependents = {name for name, deps in imports.items() if deps & stale} - stale
+        if not dependents:
+            break
+        stale |= dependents
+    order = []
+    while stale:
+        # A module is ready once nothing it imports is still waiting; an import cycle goes in name order
+        ready = sorted(name for name in stale if not imports[name] & stale) or sorted(stale)
+        order += ready
+        stale -= set(ready)
+    return order
+
+
+def data_charts(paths):
+    """
+    Charts built on a module that names one of the changed data files. Only
+    files a module declares in DATA_FILES are in the render cache key, so
+    these are redrawn rather than trusted to the key
+    """
+    import charts
+
+    data = [path for path in paths if not path.endswith(('.py', '.md'))]
+    if not data:
+        return set()
+    modules = set(reload_order(changed_modules(data)))
+    return {name for name, plot in charts.CHARTS.items() if plot.__module__ in modules}
+
+
+# ============================================
+# Rebuilding
+# ============================================
+def chart_keys(names=None):
+    """{chart filename: render cache key of its default PNG} for the given charts (default all)."""
+    import charts
+    import figures
+    import render_cache
+
+    return {name: render_cache.figure_key(charts.CHARTS[name], figures.SAVEFIG_KWARGS)
+            for name in (charts.CHARTS if names is None else names)}
+
+
+def section_hashes():
+    """{section index: hash} of the compiled report (unchanged sections come from the compile cache)."""
+    import generate_pdf
+
+    return {section['index']: section['hash'] for section in generate_pdf.compile_report()}
+
+
+def _built(timings, name, start, saved):
+    timings[name] = time.perf_counter() - start
+    print(f"  built {name:<32} {timings[name]:6.2f}s"
+          + (f"  ({time.time() - saved:.2f}s after the save)" if saved else ''), flush=True)
+
+
+def rebuild(state, formats=('png',), report=True, modules=None, saved=None, force=()):
+    """
+    Redraw the charts whose key changed since `state` and, if any report
+    section changed, the PDF and HTML; returns {output: seconds}. state
+    holds the keys and section hashes of the last successful build. Only
+    charts defined in `modules` (the reloaded ones; default all) can have
+    changed; the charts in `force` are redrawn past the render cache
+    whatever their key. Outputs are reported as they are written, with the
+    time since `saved` (a time.time() of the save that triggered the rebuild)
+    """
+    import matplotlib.pyplot as plt
+
+    import charts
+    import figures
+    import generate_pdf
+
+    # A chart that failed last time has no key yet and is always retried
+    names = [name for name, plot in charts.CHARTS.items()
+             if modules is None or plot.__module__ in modules or name not in state['charts'] or name in force]
+    timings = {}
+    for name, key in chart_keys(names).items():
+        if state['charts'].get(name) == key and name not in force:
+            continue
+        start = time.perf_counter()
+        try:
+            figures.write_chart(name, charts.CHARTS[name], name not in force, formats)
+        except Exception:
+            print(f"  failed {name}:\n{traceback.format_exc()}", file=sys.stderr)
+            continue
+        finally:
+            plt.close('all')
+        _built(timings, name, start, saved)
+        state['charts'][name] = key
+
+    if report:
+        hashes = section_hashes()
+        changed = sorted(index for index in hashes.keys() | state['sections'].keys()
+                         if hashes.get(index) != state['sections'].get(index))
+        if changed:
+            print(f"  report sections changed: {', '.join(map(str, changed))}")
+            for filename, build in [(generate_pdf.PDF_FILENAME, generate_pdf.build_pdf),
+                                    (generate_pdf.HTML_FILENAME, generate_pdf.build_html)]:
+                start = time.perf_counter()
+                build()
+                _built(timings, filename, start, saved)
+            state['sections'] = hashes
+    return timings
+
+
+def watch(formats=('png',), report=True, poll=POLL, debounce=DEBOUNCE):
+    """Build what is out of date, then rebuild on every change until interrupted."""
+    import render_worker
+
+    start = time.perf_counter()
+    render_worker.warm()
+    state = {'charts': {}, 'sections': {}}
+    files = watched_files()
+    timings = rebuild(state, formats, report)
+    print(f"Up to date in {time.perf_counter() - start:.2f}s ({len(timings)} outputs); "
+          f"watching {len(files)} files", flush=True)
+    try:
+        while True:
+            files, paths = wait_for_changes(files, poll, debounce)
+            saved = max((files[path][0] / 1e9 for path in paths if path in files), default=time.time())
+            print(f"Changed: {', '.join(sorted(os.path.relpath(path, REPO_DIR) for path in paths))}")
+            start = time.perf_counter()
+            try:
+                names = reload_order(changed_modules(paths))
+                for name in names:
+                    importlib.reload(sys.modules[name])
+                timings = rebuild(state, formats, report, set(names), saved, data_charts(paths))
+            except Exception:
+                # Typically a syntax error mid-edit; the next save tries again
+                print(traceback.format_exc(), file=sys.stderr, flush=True)
+                continue
+            print(f"{len(timings) or 'Nothing'} rebuilt in {time.perf_counter() - start:.2f}s "
+                  f"({time.time() - saved:.2f}s after the save)"
+                  + (f"; reloaded {', '.join(names)}" if names else ''), flush=True)
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    import figures
+
+    parser = argparse.ArgumentParser(description='Rebuild the charts and report on every save')
+    parser.add_argument('--formats', default='png', help='comma-separated chart formats (see build.py)')
+    parser.add_argument('--no-report', action='store_true', help='charts only; skip the PDF and HTML')
+    parser.add_argument('-o', '--output-dir', help='write the outputs here (default: $LLM_FORECAST_OUTPUT '
+                                                   'or the script directory)')
+    parser.add_argument('--poll', type=float, default=POLL, help=f'seconds between scans (default: {POLL})')
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE,
+                        help=f'seconds of quiet after a save before rebuilding (default: {DEBOUNCE})')
+    args = parser.parse_args()
+    formats = tuple(args.formats.split(','))
+    unknown = [fmt for fmt in formats if fmt not in figures.FORMATS and fmt != 'thumb']
+    if unknown:
+        parser.error(f"unknown format: {', '.join(unknown)}")
+
+    if args.output_dir:
+        figures.set_output_dir(args.output_dir)
+    watch(formats, not args.no_report, args.poll, args.debounce)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())